@@ -8,13 +8,27 @@ bl_info = {
     "category": "Import-Export"
 }
 
-from . import props, ops, ui
+from . import props, client, config_sync, health, hierarchy, instancing, library_cache, prefetch, previews, results, search, search_index, ops, ui
 def register():
     props.register()  # ✅ must be first
+    client.register()
+    hierarchy.register()
+    search.register()
     ops.register()
     ui.register()
 
 def unregister():
     ui.unregister()
     ops.unregister()
+    health.unregister()
+    config_sync.unregister()
+    previews.unregister()
+    prefetch.unregister()
+    library_cache.unregister()
+    instancing.unregister()
+    hierarchy.unregister()
+    search_index.unregister()
+    search.unregister()
+    results.unregister()
+    client.unregister()
     props.unregister()
@@ -0,0 +1,351 @@
+"""Stand-in for CodeWalker.API with synthetic assets, for benchmarks and offline work.
+
+Plain Python, no Blender needed::
+
+    python bench/mock_server.py --port 5555 --files 50000 --latency-ms 20 --grid 32
+
+Implements the endpoints the addon uses under /api: /search-file, /download-files,
+/import, /get-config and /set-config. Every RPF entry is generated on demand
+as a drawable (YDR) or fragment (YFT) XML with a `--grid` x `--grid` vertex
+plane, so payload size scales with the grid. Both transports are supported:
+downloads are written to `outputFolderPath` or returned in the response body
+(`stream=true`), uploads are accepted as `filePaths` or as multipart bodies.
+"""
+
+import argparse
+import gzip
+import io
+import json
+import math
+import os
+import random
+import threading
+import time
+import zipfile
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ASSET_FOLDER = "x64c.rpf\\levels\\gta5\\props\\bench"
+API_PREFIX = "/api"
+
+
+# === Synthetic assets ===
+
+def make_asset_paths(count):
+    """Alternate YDR and YFT entries so both importers are exercised."""
+    return [
+        f"{ASSET_FOLDER}\\bench_prop_{i:05d}.{'ydr' if i % 2 == 0 else 'yft'}"
+        for i in range(count)
+    ]
+
+
+def _geometry_xml(grid):
+    step = 2.0 / max(1, grid - 1)
+    vertices = []
+    for y in range(grid):
+        for x in range(grid):
+            px, py = -1.0 + x * step, -1.0 + y * step
+            pz = 0.1 * math.sin(px * 3.0) * math.cos(py * 3.0)
+            u, v = x / max(1, grid - 1), y / max(1, grid - 1)
+            vertices.append(f"{px:.4f} {py:.4f} {pz:.4f}   0 0 1   255 255 255 255   {u:.4f} {v:.4f}")
+    indices = []
+    for y in range(grid - 1):
+        for x in range(grid - 1):
+            a = y * grid + x
+            indices += [a, a + 1, a + grid, a + 1, a + grid + 1, a + grid]
+    index_lines = (" ".join(str(i) for i in indices[n:n + 24]) for n in range(0, len(indices), 24))
+    return f"""      <Geometries>
+        <Item>
+          <ShaderIndex value="0" />
+          <BoundingBoxMin x="-1" y="-1" z="-0.1" />
+          <BoundingBoxMax x="1" y="1" z="0.1" />
+          <VertexBuffer>
+            <Flags value="0" />
+            <Layout type="GTAV1">
+              <Position />
+              <Normal />
+              <Colour0 />
+              <TexCoord0 />
+            </Layout>
+            <Data>
+{chr(10).join(vertices)}
+            </Data>
+          </VertexBuffer>
+          <IndexBuffer>
+            <Data>
+{chr(10).join(index_lines)}
+            </Data>
+          </IndexBuffer>
+        </Item>
+      </Geometries>"""
+
+
+def make_drawable_xml(name, grid, tag="Drawable"):
+    return f"""<{tag}>
+  <Name>{name}</Name>
+  <BoundingSphereCenter x="0" y="0" z="0" />
+  <BoundingSphereRadius value="1.42" />
+  <BoundingBoxMin x="-1" y="-1" z="-0.1" />
+  <BoundingBoxMax x="1" y="1" z="0.1" />
+  <LodDistHigh value="100" />
+  <LodDistMed value="9998" />
+  <LodDistLow value="9998" />
+  <LodDistVlow value="9998" />
+  <FlagsHigh value="1" />
+  <FlagsMed value="0" />
+  <FlagsLow value="0" />
+  <FlagsVlow value="0" />
+  <ShaderGroup>
+    <Shaders>
+      <Item>
+        <Name>default</Name>
+        <FileName>default.sps</FileName>
+        <RenderBucket value="0" />
+        <Parameters>
+          <Item name="DiffuseSampler" type="Texture">
+            <Name>givemechecker</Name>
+          </Item>
+        </Parameters>
+      </Item>
+    </Shaders>
+  </ShaderGroup>
+  <DrawableModelsHigh>
+    <Item>
+      <RenderMask value="255" />
+      <Flags value="0" />
+      <HasSkin value="0" />
+      <BoneIndex value="0" />
+      <Unknown1 value="0" />
+{_geometry_xml(grid)}
+    </Item>
+  </DrawableModelsHigh>
+</{tag}>"""
+
+
+def make_asset_xml(rpf_path, grid):
+    file_name = rpf_path.replace("\\", "/").split("/")[-1]
+    name, ext = os.path.splitext(file_name)
+    header = '<?xml version="1.0" encoding="UTF-8"?>\n'
+    if ext == ".yft":
+        drawable = make_drawable_xml(name, grid).replace("\n", "\n  ")
+        body = f"<Fragment>\n  <Name>{name}</Name>\n  <UnknownB0 value=\"0\" />\n  {drawable}\n</Fragment>\n"
+    else:
+        body = make_drawable_xml(name, grid) + "\n"
+    return f"{file_name}.xml", (header + body).encode("utf-8")
+
+
+# === Server ===
+
+class MockState:
+    def __init__(self, args):
+        self.args = args
+        self.paths = make_asset_paths(args.files)
+        self.config = {
+            "GTAPath": "C:\\Program Files\\Rockstar Games\\Grand Theft Auto V",
+            "codewalkerOutputDir": "",
+            "blenderOutputDir": "",
+            "fivemOutputDir": "",
+            "rpfArchivePath": "",
+        }
+        self.imported_files = 0
+        self.imported_bytes = 0
+        self.lock = threading.Lock()
+        self._xml_cache = {}
+
+    def asset(self, rpf_path):
+        # Generation is slow for large grids; every entry of one size looks the same anyway
+        ext = os.path.splitext(rpf_path)[1]
+        key = (ext, self.args.grid)
+        if key not in self._xml_cache:
+            self._xml_cache[key] = make_asset_xml(f"template{ext}", self.args.grid)[1]
+        file_name = rpf_path.replace("\\", "/").split("/")[-1]
+        name = os.path.splitext(file_name)[0]
+        return f"{file_name}.xml", self._xml_cache[key].replace(b"template", name.encode("utf-8"))
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None
+
+    def log_message(self, format, *args):
+        if self.state.args.verbose:
+            super().log_message(format, *args)
+
+    def _delay(self):
+        args = self.state.args
+        delay = args.latency_ms + random.uniform(0, args.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+    def _read_body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b"".join(chunks)
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _send(self, status, body, content_type="application/json"):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode("utf-8")
+        headers = {"Content-Type": content_type}
+        if self.state.args.gzip and len(body) > 1024 and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=1)
+            headers["Content-Encoding"] = "gzip"
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    @staticmethod
+    def _endpoint(url):
+        # Like CodeWalker.API, every endpoint lives under /api
+        if url.path.startswith(API_PREFIX + "/"):
+            return url.path[len(API_PREFIX):]
+        return None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        self._delay()
+        endpoint = self._endpoint(url)
+        if endpoint == "/search-file":
+            self.search(query)
+        elif endpoint == "/download-files":
+            self.download(query)
+        elif endpoint == "/get-config":
+            self.get_config()
+        else:
+            self._send(404, {"error": f"unknown endpoint {url.path}"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        body = self._read_body()
+        self._delay()
+        endpoint = self._endpoint(url)
+        if endpoint == "/import":
+            self.import_files(body)
+        elif endpoint == "/set-config":
+            # Partial payloads only touch the keys they contain
+            changes = json.loads(body or b"{}")
+            self.state.config.update(changes)
+            self._send(200, {"message": f"Updated {', '.join(changes) or 'nothing'}"})
+        else:
+            self._send(404, {"error": f"unknown endpoint {url.path}"})
+
+    def get_config(self):
+        body = json.dumps(self.state.config, sort_keys=True).encode("utf-8")
+        etag = f'"{zlib.crc32(body):08x}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def search(self, query):
+        needle = query.get("filename", [""])[0].lower()
+        matches = [path for path in self.state.paths if needle in path.lower()]
+        if "offset" in query:
+            offset = int(query["offset"][0])
+            matches = matches[offset:offset + int(query.get("limit", [len(matches)])[0])]
+        if self.state.args.ndjson:
+            body = "".join(json.dumps(path) + "\n" for path in matches).encode("utf-8")
+            self._send(200, body, "application/x-ndjson")
+        else:
+            self._send(200, matches)
+
+    def download(self, query):
+        paths = query.get("fullPaths", [])
+        unknown = [path for path in paths if path not in self.state.paths]
+        if not paths or unknown:
+            self._send(404, {"error": f"not found: {unknown or 'no paths'}"})
+            return
+
+        if query.get("stream", ["false"])[0] == "true":
+            if len(paths) == 1:
+                _file_name, data = self.state.asset(paths[0])
+                self._send(200, data, "application/xml")
+                return
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+                for path in paths:
+                    archive.writestr(*self.state.asset(path))
+            self._send(200, buffer.getvalue(), "application/zip")
+            return
+
+        directory = query.get("outputFolderPath", [self.state.config["codewalkerOutputDir"]])[0]
+        os.makedirs(directory, exist_ok=True)
+        for path in paths:
+            file_name, data = self.state.asset(path)
+            with open(os.path.join(directory, file_name), "wb") as f:
+                f.write(data)
+        self._send(200, {"message": f"Downloaded {len(paths)} file(s)"})
+
+    def import_files(self, body):
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("multipart/form-data"):
+            boundary = content_type.split("boundary=")[-1].encode("ascii")
+            count = body.count(b"--" + boundary) - 1
+        else:
+            paths = parse_qs(body.decode("utf-8")).get("filePaths", [])
+            missing = [path for path in paths if not os.path.isfile(path)]
+            if missing:
+                self._send(400, {"error": f"missing files: {missing}"})
+                return
+            count = len(paths)
+        with self.state.lock:
+            self.state.imported_files += count
+            self.state.imported_bytes += len(body)
+        self._send(200, {"message": f"Imported {count} file(s)"})
+
+
+def start_server(args):
+    handler = type("BoundMockHandler", (MockHandler,), {"state": MockState(args)})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5555)
+    parser.add_argument("--files", type=int, default=20000, help="Number of synthetic RPF entries")
+    parser.add_argument("--grid", type=int, default=32, help="Vertices per side of every synthetic mesh")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fixed delay added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra delay, up to this much")
+    parser.add_argument("--ndjson", action="store_true", help="Answer searches with NDJSON instead of a JSON array")
+    parser.add_argument("--gzip", action="store_true", help="gzip response bodies when the client accepts it")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = start_server(args)
+    print(f"Mock CodeWalker.API on http://{args.host}:{args.port} with {args.files} files", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""End-to-end timings of search, import and export against the mock CodeWalker.API.
+
+Runs inside Blender with Sollumz and the bridge enabled; the mock server is
+started as a separate process so it does not compete for Blender's GIL::
+
+    blender --background --addons sollumz,codewalker_sollumz_bridge \
+        --python bench/run_bench.py -- --iterations 20 --latency-ms 5 --output bench.json
+
+Each scenario drives the same code paths as the operators (the modal
+operators themselves need a window). Results are printed as a table and
+optionally written as JSON with p50/p95 latency and throughput, so two runs
+can be compared before and after a change.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import bpy
+
+MOCK_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_server.py")
+
+
+def parse_args(argv=None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="cw_sollumz_bench")
+    parser.add_argument("--addon", default="codewalker_sollumz_bridge", help="Module name of the installed bridge")
+    parser.add_argument("--port", type=int, default=5599)
+    parser.add_argument("--external", action="store_true", help="Use a mock server that is already running on --port")
+    parser.add_argument("--files", type=int, default=20000, help="Synthetic RPF entries served by the mock")
+    parser.add_argument("--grid", type=int, default=32, help="Vertices per side of every synthetic mesh")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--iterations", type=int, default=20, help="Samples per scenario")
+    parser.add_argument("--batch-size", type=int, default=25, help="Files per batch import")
+    parser.add_argument("--transport", choices=["SHARED_FOLDER", "STREAM"], default="SHARED_FOLDER")
+    parser.add_argument("--scenarios", default="search,import,batch_import,export,library")
+    parser.add_argument("--output", help="Write the results as JSON here")
+    parser.add_argument("--trace", help="Write a Chrome trace of all spans here")
+    return parser.parse_args(argv)
+
+
+def percentile(samples, pct):
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def summarize(name, samples, items):
+    """`samples` are seconds per iteration; `items` is what all iterations processed together."""
+    total = sum(samples)
+    return {
+        "scenario": name,
+        "iterations": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "mean_ms": round(total / len(samples) * 1000, 2),
+        "items": items,
+        "items_per_second": round(items / total, 2) if total else None,
+    }
+
+
+# === Mock server ===
+
+def start_mock_server(args):
+    # Probe the same URL the add-on uses, so a routing mismatch fails here
+    api_base_url = importlib.import_module(f"{args.addon}.utils").get_api_base_url(args.port)
+    command = [
+        sys.executable, MOCK_SERVER, "--port", str(args.port), "--files", str(args.files),
+        "--grid", str(args.grid), "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+    ]
+    process = subprocess.Popen(command)
+    deadline = time.monotonic() + 10.0
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"{api_base_url}/get-config", timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Mock server did not start")
+
+
+def configure_scene(args, work_dir):
+    bpy.ops.wm.read_homefile(use_empty=True)
+    props = bpy.context.scene.cw_sollumz_props
+    props.api_port = str(args.port)
+    props.transport_mode = args.transport
+    props.codewalker_output_dir = os.path.join(work_dir, "cw_out")
+    props.blender_output_dir = os.path.join(work_dir, "blender_out")
+    props.fivem_output_dir = os.path.join(work_dir, "fivem_out")
+    props.rpf_path = "bench.rpf"
+    # Every iteration should hit the server
+    props.use_asset_cache = False
+    props.incremental_export = False
+    props.batch_chunk_size = args.batch_size
+    for directory in (props.codewalker_output_dir, props.blender_output_dir, props.fivem_output_dir):
+        os.makedirs(directory, exist_ok=True)
+    return props
+
+
+# === Scenarios ===
+
+class Bench:
+    def __init__(self, args, props):
+        self.args = args
+        self.props = props
+        self.client_module = importlib.import_module(f"{args.addon}.client")
+        self.pipeline = importlib.import_module(f"{args.addon}.pipeline")
+        self.transport = importlib.import_module(f"{args.addon}.transport")
+        self.utils = importlib.import_module(f"{args.addon}.utils")
+        self.client = self.client_module.get_client(props)
+        response = self.client.request("GET", "/search-file", params={"filename": "bench_prop_"})
+        response.raise_for_status()
+        self.paths = response.json()
+        self.next_path = 0
+
+    def take_paths(self, count):
+        if self.next_path + count > len(self.paths):
+            raise RuntimeError("Not enough synthetic files, raise --files")
+        paths = self.paths[self.next_path:self.next_path + count]
+        self.next_path += count
+        return paths
+
+    def search(self):
+        samples = []
+        results = 0
+        for i in range(self.args.iterations):
+            query = f"bench_prop_{i % 100:02d}"
+            started = time.perf_counter()
+            response = self.client.request("GET", "/search-file", params={"filename": query})
+            results += len(response.json())
+            samples.append(time.perf_counter() - started)
+        return summarize("search", samples, results)
+
+    def single_import(self):
+        samples = []
+        directory = self.props.codewalker_output_dir
+        for path in self.take_paths(self.args.iterations):
+            started = time.perf_counter()
+            job = self.transport.submit_download(self.client, self.props.transport_mode, [path], directory)
+            job.wait()
+            error = job.error_message()
+            if error:
+                raise RuntimeError(f"Download of {path} failed: {error}")
+            if not self.utils.import_file(directory, os.path.basename(path.replace("\\", "/")) + ".xml"):
+                raise RuntimeError(f"Sollumz import of {path} failed")
+            samples.append(time.perf_counter() - started)
+        return summarize("single import", samples, len(samples))
+
+    def batch_import(self):
+        samples = []
+        files = 0
+        for _ in range(self.args.iterations):
+            paths = self.take_paths(self.args.batch_size)
+            started = time.perf_counter()
+            batch = self.pipeline.ImportBatch(self.props, paths)
+            jobs = batch.submit_downloads(self.client)
+            for (directory, chunk), job in zip(batch.chunks, jobs):
+                job.wait()
+                batch.complete_chunk(directory, chunk, job.error_message())
+            files += batch.import_all()
+            samples.append(time.perf_counter() - started)
+            if batch.errors:
+                print(f"[ERROR] Batch import: {batch.errors[:3]}")
+        return summarize("batch import", samples, files)
+
+    def export(self):
+        context = bpy.context
+        roots = self.utils.promote_to_root_objects(context.scene.objects)
+        if not roots:
+            raise RuntimeError("Nothing to export, run an import scenario first")
+        samples = []
+        warnings = []
+        started = time.perf_counter()
+        run = self.pipeline.ExportRun(context, roots, lambda level, message: warnings.append(message))
+        while run.pending:
+            object_started = time.perf_counter()
+            run.export_next(context)
+            samples.append(time.perf_counter() - object_started)
+        while not run.uploader.done:
+            time.sleep(0.01)
+        total = time.perf_counter() - started
+        for message in warnings + run.uploader.errors:
+            print(f"[ERROR] Export: {message}")
+        result = summarize("export (per object)", samples, run.exported)
+        # Throughput includes the uploads that finish after the last export
+        result["items_per_second"] = round(run.exported / total, 2) if total else None
+        result["uploaded_files"] = run.uploader.uploaded_files
+        return result
+
+    def library_import(self):
+        """Import the same cached assets once from the XML and once from the .blend library."""
+        props = self.props
+        # Cache entries are validated against the source archive, which the mock does not have
+        props.gtapath = os.path.dirname(props.codewalker_output_dir)
+        archive = os.path.join(props.gtapath, self.paths[0].split("\\", 1)[0])
+        open(archive, "ab").close()
+        props.use_asset_cache = True
+        props.use_library_cache = True
+        paths = self.take_paths(self.args.iterations)
+        try:
+            # Download, import and write the library once
+            self.import_batches(paths)
+            props.use_library_cache = False
+            xml_samples = self.import_batches(paths)
+            props.use_library_cache = True
+            library_samples = self.import_batches(paths)
+        finally:
+            props.use_asset_cache = False
+            props.use_library_cache = False
+        return [
+            summarize("import cached xml", xml_samples, len(xml_samples)),
+            summarize("import .blend library", library_samples, len(library_samples)),
+        ]
+
+    def import_batches(self, paths):
+        samples = []
+        for path in paths:
+            started = time.perf_counter()
+            batch = self.pipeline.ImportBatch(self.props, [path])
+            for (directory, chunk), job in zip(batch.chunks, batch.submit_downloads(self.client)):
+                job.wait()
+                batch.complete_chunk(directory, chunk, job.error_message())
+            if batch.import_all() != 1:
+                raise RuntimeError(f"Import of {path} failed: {batch.errors}")
+            samples.append(time.perf_counter() - started)
+        return samples
+
+
+def print_table(results):
+    print(f"{'scenario':<22}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'items/s':>10}")
+    for result in results:
+        print(f"{result['scenario']:<22}{result['iterations']:>6}{result['p50_ms']:>10}{result['p95_ms']:>10}{result['items_per_second']:>10}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    work_dir = tempfile.mkdtemp(prefix="cw_sollumz_bench_")
+    server = None if args.external else start_mock_server(args)
+    try:
+        props = configure_scene(args, work_dir)
+        bench = Bench(args, props)
+        runners = {
+            "search": bench.search,
+            "import": bench.single_import,
+            "batch_import": bench.batch_import,
+            "export": bench.export,
+            "library": bench.library_import,
+        }
+        results = []
+        for name in scenarios:
+            result = runners[name]()
+            results.extend(result if isinstance(result, list) else [result])
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_table(results)
+    report = {
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "trace")},
+        "blender": bpy.app.version_string,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+    if args.trace:
+        importlib.import_module(f"{args.addon}.profiling").profiler.save(args.trace, 'CHROME')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import json
+import os
+import shutil
+import time
+
+from .texture_store import TextureStore
+
+CACHE_DIR_NAME = ".cw_cache"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+_caches = {}
+
+
+def get_archive_path(gtapath, rpf_path):
+    """Return the on-disk archive that contains a CodeWalker entry path.
+
+    `x64i.rpf\\levels\\gta5\\props\\prop_x.ydr` resolves to
+    `<gtapath>\\x64i.rpf`. Nested archives resolve to their outermost file.
+    """
+    lower = rpf_path.lower()
+    index = lower.find(".rpf")
+    if index == -1:
+        return None
+    archive = rpf_path[:index + 4]
+    if os.path.isabs(archive):
+        return archive
+    return os.path.join(gtapath, archive)
+
+
+def get_source_signature(gtapath, rpf_path):
+    """Return `[size, mtime_ns]` of the source archive, or None if it can't be found."""
+    archive = get_archive_path(gtapath, rpf_path)
+    if not archive:
+        return None
+    try:
+        stat = os.stat(archive)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def get_xml_name(rpf_path):
+    return os.path.basename(rpf_path.replace("\\", "/")) + ".xml"
+
+
+def get_texture_dir_name(xml_name):
+    return xml_name.split(".", 1)[0]
+
+
+def _path_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for f in files:
+            try:
+                total += os.path.getsize(os.path.join(root, f))
+            except OSError:
+                pass
+    return total
+
+
+class AssetCache:
+    """LRU cache of CodeWalker XML exports under `codewalker_output_dir`.
+
+    Entries are keyed by the full RPF entry path and validated against the
+    size/mtime of the source archive. All files live in one flat directory so a
+    batch can be handed to a single Sollumz import; a different RPF path with
+    the same file name replaces the older entry.
+    """
+
+    def __init__(self, output_dir, max_bytes):
+        self.directory = os.path.join(output_dir, CACHE_DIR_NAME)
+        self.manifest_path = os.path.join(self.directory, MANIFEST_NAME)
+        self.max_bytes = max_bytes
+        self.dedupe_textures = True
+        self.textures = TextureStore(self.directory)
+        self.entries = self._load()
+
+    @staticmethod
+    def entry_key(rpf_path):
+        return rpf_path.replace("/", "\\").lower()
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                return manifest.get("entries", {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "entries": self.entries}, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def ensure_directory(self):
+        os.makedirs(self.directory, exist_ok=True)
+        return self.directory
+
+    def prepare_download(self, rpf_paths):
+        """Detach deduplicated textures the downloads of `rpf_paths` will overwrite."""
+        for rpf_path in rpf_paths:
+            self.textures.release(os.path.join(self.directory, get_texture_dir_name(get_xml_name(rpf_path))))
+
+    def lookup(self, rpf_path, signature, save=True):
+        """Return the cached XML file name for `rpf_path`, or None on a miss."""
+        if signature is None:
+            return None
+        key = self.entry_key(rpf_path)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry["signature"] != signature or not os.path.isfile(os.path.join(self.directory, entry["file"])):
+            self._remove(key)
+            if save:
+                self.save()
+            return None
+        entry["last_access"] = time.time()
+        if save:
+            self.save()
+        return entry["file"]
+
+    def store(self, rpf_path, signature, save=True):
+        """Record the freshly downloaded XML for `rpf_path` and evict if over budget.
+
+        Returns False if nothing was written or the source can't be validated.
+        """
+        if signature is None:
+            return False
+        xml_name = get_xml_name(rpf_path)
+        xml_path = os.path.join(self.directory, xml_name)
+        if not os.path.isfile(xml_path):
+            return False
+
+        key = self.entry_key(rpf_path)
+        # The download overwrote any other entry that used the same file name
+        for other_key, other in list(self.entries.items()):
+            if other_key != key and other["file"].lower() == xml_name.lower():
+                del self.entries[other_key]
+
+        texture_dir = get_texture_dir_name(xml_name)
+        size = _path_size(xml_path)
+        if os.path.isdir(os.path.join(self.directory, texture_dir)):
+            size += _path_size(os.path.join(self.directory, texture_dir))
+            if self.dedupe_textures:
+                # Textures linked to an already stored copy take no new space
+                size -= self.textures.dedupe(os.path.join(self.directory, texture_dir))
+
+        self.entries[key] = {
+            "file": xml_name,
+            "textures": texture_dir,
+            "signature": signature,
+            "bytes": size,
+            "last_access": time.time(),
+        }
+        self.evict(keep=key)
+        if save:
+            self.save()
+        return True
+
+    def total_bytes(self):
+        return sum(entry["bytes"] for entry in self.entries.values())
+
+    def evict(self, keep=None):
+        """Drop least recently used entries until the cache fits `max_bytes`."""
+        total = self.total_bytes()
+        removed = False
+        for key in sorted(self.entries, key=lambda k: self.entries[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self.entries[key]["bytes"]
+            self._remove(key)
+            removed = True
+        if removed:
+            self.textures.prune()
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        try:
+            os.remove(os.path.join(self.directory, entry["file"]))
+        except OSError:
+            pass
+        # Texture folders are shared by files with the same stem (e.g. .ydr and .ytd)
+        if not any(other["textures"] == entry["textures"] for other in self.entries.values()):
+            shutil.rmtree(os.path.join(self.directory, entry["textures"]), ignore_errors=True)
+
+    def clear(self):
+        self.entries = {}
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def get_asset_cache(props):
+    """Return the cache for the current output directory, or None if disabled."""
+    if not props.use_asset_cache:
+        return None
+    output_dir = os.path.normcase(os.path.abspath(props.codewalker_output_dir))
+    cache = _caches.get(output_dir)
+    if cache is None:
+        cache = _caches[output_dir] = AssetCache(props.codewalker_output_dir, 0)
+    cache.max_bytes = props.cache_size_mb * 1024 * 1024
+    cache.dedupe_textures = props.dedupe_textures
+    return cache
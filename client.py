@@ -0,0 +1,176 @@
+import bpy
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .profiling import span
+from .utils import get_api_base_url
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_RETRIES = 2
+DEFAULT_POOL_SIZE = 4
+DISPATCH_INTERVAL = 0.05
+
+# Finished jobs waiting for their callback to run on the main thread. Shared by
+# every client so callbacks still fire after the client is rebuilt.
+_completed_jobs = queue.Queue()
+_client = None
+
+
+class RequestJob:
+    """A single request running on the client's worker pool.
+
+    `response` or `error` is set once `done` is true. Cancelling a job does not
+    abort the underlying socket read, it only discards the result.
+    """
+
+    def __init__(self, method, path, kwargs, callback=None, consume=None, task=None):
+        self.method = method
+        self.path = path
+        self.kwargs = kwargs
+        self.callback = callback
+        self.consume = consume
+        self.task = task
+        self.result = None
+        self.response = None
+        self.error = None
+        self.cancelled = False
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def error_message(self):
+        """Return a human readable error, or None if the request succeeded."""
+        if self.error is not None:
+            return str(self.error)
+        if self.task is not None:
+            return None
+        if self.response is None:
+            return "No response"
+        if self.response.status_code != 200:
+            return f"HTTP {self.response.status_code}"
+        return None
+
+
+class BridgeClient:
+    """Keep-alive HTTP client for CodeWalker.API with a background worker pool."""
+
+    def __init__(self, port, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, pool_size=DEFAULT_POOL_SIZE):
+        self.config = (port, timeout, retries, pool_size)
+        self.port = port
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="cw_sollumz")
+
+    def url(self, path):
+        return f"{get_api_base_url(self.port)}{path}"
+
+    def request(self, method, path, **kwargs):
+        """Blocking request on the calling thread with the client timeout applied."""
+        kwargs.setdefault("timeout", self.timeout)
+        with span(f"HTTP {method} {path}") as metrics:
+            response = self.session.request(method, self.url(path), **kwargs)
+            metrics["status"] = response.status_code
+            # Streamed bodies are read later by the caller
+            if not kwargs.get("stream"):
+                metrics["bytes"] = len(response.content)
+            return response
+
+    def submit(self, method, path, callback=None, consume=None, **kwargs):
+        """Queue a request on the worker pool and return its `RequestJob`.
+
+        `consume(job)` runs on the worker thread right after the response
+        arrives, which is where `stream=True` bodies should be read.
+        `callback(job)` is invoked on the main thread from a `bpy.app.timers`
+        tick once the request has finished, unless the job was cancelled.
+        """
+        job = RequestJob(method, path, kwargs, callback, consume)
+        self._executor.submit(self._run, job)
+        return job
+
+    def submit_task(self, task, callback=None, name="task"):
+        """Run `task(job)` on the worker pool; its return value ends up in `job.result`."""
+        job = RequestJob(None, name, {}, callback, task=task)
+        self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job):
+        if not job.cancelled:
+            try:
+                if job.task is not None:
+                    with span(f"task {job.path}"):
+                        job.result = job.task(job)
+                else:
+                    job.response = self.request(job.method, job.path, **job.kwargs)
+                    if job.consume is not None and job.response.status_code == 200:
+                        job.consume(job)
+            except Exception as e:
+                job.error = e
+        job._done.set()
+        if job.callback is not None:
+            _completed_jobs.put(job)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+
+def get_client(props):
+    """Return the shared client, rebuilding it when the connection settings change."""
+    global _client
+    config = (props.api_port, props.request_timeout, props.request_retries, props.connection_pool_size)
+    if _client is None or _client.config != config:
+        if _client is not None:
+            _client.close()
+        _client = BridgeClient(*config)
+    return _client
+
+
+def dispatch_completed_jobs():
+    """Run callbacks of finished jobs. Must be called from the main thread."""
+    while True:
+        try:
+            job = _completed_jobs.get_nowait()
+        except queue.Empty:
+            return
+        if job.cancelled:
+            continue
+        try:
+            job.callback(job)
+        except Exception as e:
+            print(f"[ERROR] Callback for {job.path} failed: {e}")
+
+
+def _dispatch_timer():
+    dispatch_completed_jobs()
+    return DISPATCH_INTERVAL
+
+
+def register():
+    if not bpy.app.timers.is_registered(_dispatch_timer):
+        bpy.app.timers.register(_dispatch_timer, persistent=True)
+
+
+def unregister():
+    global _client
+    if bpy.app.timers.is_registered(_dispatch_timer):
+        bpy.app.timers.unregister(_dispatch_timer)
+    if _client is not None:
+        _client.close()
+        _client = None
@@ -0,0 +1,148 @@
+import bpy
+import hashlib
+import json
+
+from .client import get_client
+
+# Folder picks in quick succession are sent as one /set-config request
+DEBOUNCE_INTERVAL = 0.5
+
+CONFIG_KEYS = ("GTAPath", "codewalkerOutputDir", "blenderOutputDir", "fivemOutputDir", "rpfArchivePath")
+
+# Backend config per API port, as of the last successful push or pull
+_synced = {}
+_pending_scene = None
+
+
+def build_config_payload(props):
+    return {
+        "GTAPath": props.gtapath,
+        "codewalkerOutputDir": props.codewalker_output_dir,
+        "blenderOutputDir": props.blender_output_dir,
+        "fivemOutputDir": props.fivem_output_dir,
+        "rpfArchivePath": props.rpf_path
+    }
+
+
+def payload_digest(payload):
+    return hashlib.blake2b(json.dumps(payload, sort_keys=True).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SyncedConfig:
+    """What one backend is known to hold, so unchanged keys are never re-sent.
+
+    The API may reload its RPF manager (or rescan the whole install after a
+    GTA path change) on every /set-config, so avoiding redundant pushes
+    matters more than the request itself.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.digest = None
+        self.etag = None
+        self.error = None
+
+    def changes(self, payload):
+        if payload_digest(payload) == self.digest:
+            return {}
+        return {key: value for key, value in payload.items() if self.values.get(key) != value}
+
+    def remember(self, values, etag=None):
+        self.values.update({key: values[key] for key in CONFIG_KEYS if key in values})
+        self.digest = payload_digest(self.values) if len(self.values) == len(CONFIG_KEYS) else None
+        # A push changes the backend's version, so the old tag no longer applies
+        self.etag = etag
+        self.error = None
+
+
+def get_synced_config(props):
+    return _synced.setdefault(props.api_port, SyncedConfig())
+
+
+def forget_synced_config(port):
+    """Drop what is known about the backend on `port`, so the next sync sends everything."""
+    _synced.pop(port, None)
+
+
+def submit_push(props, force=False, callback=None):
+    """Send the keys that differ from the backend's last known config.
+
+    Returns the job, or None when there is nothing to send. `force` sends the
+    full payload, e.g. after the backend was restarted with another config.
+    """
+    payload = build_config_payload(props)
+    state = get_synced_config(props)
+    changes = dict(payload) if force else state.changes(payload)
+    if not changes:
+        return None
+    client = get_client(props)
+
+    def push(job):
+        try:
+            response = client.request("POST", "/set-config", json=changes)
+            response.raise_for_status()
+        except Exception as e:
+            state.error = str(e)
+            raise
+        state.remember(changes)
+        return changes
+
+    return client.submit_task(push, callback=callback, name="/set-config")
+
+
+def submit_pull(props):
+    """Fetch the backend config; `job.result` is `(config, changed)`.
+
+    Sends If-None-Match with the last ETag so an unchanged config costs a 304
+    instead of a full response. Servers without ETags always answer 200.
+    """
+    state = get_synced_config(props)
+    client = get_client(props)
+
+    def pull(job):
+        headers = {"If-None-Match": state.etag} if state.etag else {}
+        response = client.request("GET", "/get-config", headers=headers)
+        if response.status_code == 304:
+            return dict(state.values), False
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        config = response.json()
+        state.remember(config, etag=response.headers.get("ETag"))
+        return config, True
+
+    return client.submit_task(pull, name="/get-config")
+
+
+# === Debounced push ===
+
+def _on_push_finished(job):
+    error = job.error_message()
+    if error:
+        print(f"[ERROR] Config sync failed: {error}")
+
+
+def _flush_pending_push():
+    global _pending_scene
+    scene = bpy.data.scenes.get(_pending_scene) if _pending_scene else None
+    _pending_scene = None
+    if scene is not None:
+        submit_push(scene.cw_sollumz_props, callback=_on_push_finished)
+    return None
+
+
+def schedule_push(scene):
+    """Push the scene's config once edits have settled for DEBOUNCE_INTERVAL."""
+    global _pending_scene
+    _pending_scene = scene.name
+    # Re-registering restarts the countdown
+    if bpy.app.timers.is_registered(_flush_pending_push):
+        bpy.app.timers.unregister(_flush_pending_push)
+    bpy.app.timers.register(_flush_pending_push, first_interval=DEBOUNCE_INTERVAL)
+
+
+def unregister():
+    global _pending_scene
+    _pending_scene = None
+    if bpy.app.timers.is_registered(_flush_pending_push):
+        bpy.app.timers.unregister(_flush_pending_push)
+    _synced.clear()
@@ -0,0 +1,207 @@
+import bpy
+import hashlib
+import json
+import os
+from array import array
+
+from .texture_store import get_file_hash
+from .utils import get_descendants, to_plain_value
+
+MANIFEST_NAME = ".cw_export_manifest.json"
+MANIFEST_VERSION = 1
+
+_SIMPLE_RNA_TYPES = {'BOOLEAN', 'INT', 'FLOAT', 'STRING', 'ENUM'}
+# Editor state that Sollumz doesn't export; hashing it would re-push on every click
+_UI_RNA_PROPS = {"rna_type", "select", "location", "width", "height", "dimensions", "hide", "show_options", "show_preview", "show_texture"}
+
+
+def _update(h, value):
+    h.update(repr(value).encode("utf-8"))
+    h.update(b"\0")
+
+
+def _hash_rna(h, struct):
+    """Hash every editable simple (non-pointer, non-collection) RNA property of `struct`."""
+    for prop in struct.bl_rna.properties:
+        if prop.identifier in _UI_RNA_PROPS or prop.type not in _SIMPLE_RNA_TYPES or prop.is_readonly:
+            continue
+        value = getattr(struct, prop.identifier, None)
+        if getattr(prop, "is_array", False) and value is not None:
+            value = tuple(value)
+        elif isinstance(value, set):
+            value = tuple(sorted(value))
+        _update(h, (prop.identifier, value))
+
+
+def _hash_idprops(h, struct):
+    # Sollumz keeps its settings (shader and texture properties, flags) in ID properties
+    for key in sorted(k for k in struct.keys() if not k.startswith("_")):
+        _update(h, (key, to_plain_value(struct[key])))
+
+
+def _hash_collection(h, collection, attribute, typecode, width):
+    data = array(typecode, [0]) * (len(collection) * width)
+    collection.foreach_get(attribute, data)
+    h.update(data.tobytes())
+
+
+def _hash_mesh(h, mesh):
+    _update(h, (mesh.name, len(mesh.vertices), len(mesh.loops), len(mesh.polygons)))
+    _hash_collection(h, mesh.vertices, "co", 'f', 3)
+    _hash_collection(h, mesh.loops, "vertex_index", 'i', 1)
+    _hash_collection(h, mesh.polygons, "loop_total", 'i', 1)
+    _hash_collection(h, mesh.polygons, "material_index", 'i', 1)
+    for uv_layer in mesh.uv_layers:
+        _update(h, uv_layer.name)
+        _hash_collection(h, uv_layer.data, "uv", 'f', 2)
+    for attribute in mesh.color_attributes:
+        _update(h, (attribute.name, attribute.domain, attribute.data_type))
+        _hash_collection(h, attribute.data, "color", 'f', 4)
+    _update(h, mesh.has_custom_normals)
+    if mesh.has_custom_normals:
+        # Blender 4.1 moved split normals from loops to corner_normals
+        if hasattr(mesh, "corner_normals"):
+            _hash_collection(h, mesh.corner_normals, "vector", 'f', 3)
+        else:
+            _hash_collection(h, mesh.loops, "normal", 'f', 3)
+    if mesh.shape_keys is not None:
+        for key_block in mesh.shape_keys.key_blocks:
+            _update(h, (key_block.name, key_block.value, key_block.relative_key.name, key_block.mute))
+            _hash_collection(h, key_block.data, "co", 'f', 3)
+
+
+def _hash_vertex_weights(h, obj):
+    _update(h, [group.name for group in obj.vertex_groups])
+    if not obj.vertex_groups:
+        return
+    # Weights have no foreach access, one pass over the vertices it is
+    weights = array('f')
+    for vertex in obj.data.vertices:
+        weights.append(len(vertex.groups))
+        for element in vertex.groups:
+            weights.append(element.group)
+            weights.append(element.weight)
+    h.update(weights.tobytes())
+
+
+def _hash_armature(h, armature):
+    _update(h, (armature.name, len(armature.bones)))
+    for bone in armature.bones:
+        _update(h, (bone.name, bone.parent.name if bone.parent else None, bone.use_connect, bone.use_deform))
+        h.update(array('f', (v for row in bone.matrix_local for v in row)).tobytes())
+        h.update(array('f', (*bone.head_local, *bone.tail_local)).tobytes())
+        _hash_idprops(h, bone)
+
+
+def _hash_image(h, image):
+    _update(h, (image.name, image.source, image.filepath))
+    if image.packed_file is not None and not image.is_dirty:
+        h.update(image.packed_file.data)
+        return
+    if image.is_dirty or image.source == 'GENERATED':
+        # Unsaved edits only exist in memory, so the pixels are the content
+        pixels = array('f', [0.0]) * len(image.pixels)
+        image.pixels.foreach_get(pixels)
+        h.update(pixels.tobytes())
+        return
+    try:
+        _update(h, get_file_hash(bpy.path.abspath(image.filepath, library=image.library)))
+    except OSError:
+        _update(h, None)
+
+
+def _hash_material(h, material, images_seen):
+    if material is None:
+        _update(h, None)
+        return
+    _update(h, material.name)
+    _hash_rna(h, material)
+    _hash_idprops(h, material)
+    if material.node_tree is None:
+        return
+    for node in material.node_tree.nodes:
+        image = getattr(node, "image", None)
+        _update(h, (node.bl_idname, node.name))
+        # Parameter values, texture flags and math/mix modes are node settings, not sockets
+        _hash_rna(h, node)
+        _hash_idprops(h, node)
+        if image is not None and image.name not in images_seen:
+            images_seen.add(image.name)
+            _hash_image(h, image)
+        elif image is not None:
+            _update(h, image.name)
+        for socket in node.inputs:
+            if not socket.is_linked and hasattr(socket, "default_value"):
+                value = socket.default_value
+                _update(h, (socket.identifier, tuple(value) if hasattr(value, "__len__") else value))
+
+
+def _hash_object(h, obj, materials_seen, images_seen):
+    _update(h, (obj.name, obj.type, obj.parent.name if obj.parent else None))
+    h.update(array('f', (v for row in obj.matrix_world for v in row)).tobytes())
+    _update(h, getattr(obj, "sollum_type", None))
+
+    _hash_idprops(h, obj)
+    if obj.data is not None:
+        _hash_idprops(h, obj.data)
+
+    for modifier in obj.modifiers:
+        _hash_rna(h, modifier)
+
+    if obj.type == 'MESH' and obj.data is not None:
+        _hash_mesh(h, obj.data)
+        _hash_vertex_weights(h, obj)
+    elif obj.type == 'ARMATURE' and obj.data is not None:
+        _hash_armature(h, obj.data)
+        for pose_bone in obj.pose.bones:
+            _update(h, pose_bone.name)
+            h.update(array('f', (v for row in pose_bone.matrix_basis for v in row)).tobytes())
+
+    for slot in obj.material_slots:
+        material = slot.material
+        # Materials shared by several children only need hashing once
+        if material is not None and material.name in materials_seen:
+            _update(h, material.name)
+            continue
+        if material is not None:
+            materials_seen.add(material.name)
+        _hash_material(h, material, images_seen)
+
+
+def compute_object_fingerprint(root):
+    """Return a hex digest of everything Sollumz exports for `root` and its children."""
+    h = hashlib.blake2b(digest_size=16)
+    materials_seen = set()
+    images_seen = set()
+    for obj in [root] + sorted(get_descendants(root), key=lambda o: o.name):
+        _hash_object(h, obj, materials_seen, images_seen)
+    return h.hexdigest()
+
+
+class ExportManifest:
+    """Sidecar in `blender_output_dir` recording what was last pushed per object."""
+
+    def __init__(self, output_dir):
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                self.entries = manifest.get("objects", {})
+        except (OSError, ValueError):
+            pass
+
+    def is_unchanged(self, name, fingerprint, target):
+        entry = self.entries.get(name)
+        return entry is not None and entry["fingerprint"] == fingerprint and entry["target"] == target
+
+    def update(self, name, fingerprint, target):
+        self.entries[name] = {"fingerprint": fingerprint, "target": target}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "objects": self.entries}, f)
+        os.replace(tmp_path, self.path)
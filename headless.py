@@ -0,0 +1,280 @@
+"""Command-line batch driver for imports and exports without the UI.
+
+Run it inside Blender with the bridge and Sollumz enabled::
+
+    blender --background --addons sollumz,codewalker_sollumz_bridge \
+        --python-expr "from codewalker_sollumz_bridge import headless; headless.main()" \
+        -- --manifest jobs.json --jobs 4 --output results.jsonl
+
+The manifest is JSON::
+
+    {
+        "settings": {"api_port": "5555", "codewalker_output_dir": "C:\\GTA_FILES\\cw_out"},
+        "import": ["x64i.rpf\\levels\\gta5\\props\\prop_bench_01a.ydr", {"search": "prop_bin_", "limit": 20}],
+        "import_save_as": "C:\\GTA_FILES\\imported.blend",
+        "export": [{"blend": "C:\\maps\\pack.blend", "collection": "Props"}]
+    }
+
+`settings` overrides scene properties of the bridge. Import and export items
+are dealt round-robin to shards; `--jobs N` starts N Blender processes, one per
+shard, and merges their results. With more than one shard, each works in a
+`shardK` subfolder of the CodeWalker and Blender output directories, so the
+asset cache, export manifest and journals are never written by two processes.
+Every result is one JSON line; the last line is a summary with throughput and
+failure counts.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import bpy
+
+from .client import get_client
+from .pipeline import ExportRun, ImportBatch
+from .profiling import profiler
+from .utils import promote_to_root_objects
+
+
+def parse_args(argv=None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="cw_sollumz_headless")
+    parser.add_argument("--manifest", required=True, help="JSON manifest of imports and exports")
+    parser.add_argument("--output", help="Write JSON lines here instead of stdout")
+    parser.add_argument("--shard", default="0/1", help="Process only shard K of N, e.g. 2/4")
+    parser.add_argument("--jobs", type=int, default=1, help="Start this many Blender processes, one per shard")
+    parser.add_argument("--trace", help="Write a Chrome trace of this process's timings")
+    return parser.parse_args(argv)
+
+
+def load_manifest(path):
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    items = [("import", item) for item in manifest.get("import", [])]
+    items += [("export", item) for item in manifest.get("export", [])]
+    return manifest, items
+
+
+def apply_settings(settings):
+    props = bpy.context.scene.cw_sollumz_props
+    for key, value in settings.items():
+        if not hasattr(props, key):
+            raise ValueError(f"Unknown setting '{key}'")
+        setattr(props, key, value)
+    return props
+
+
+class ResultWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8") if path else sys.stdout
+        self.failed = 0
+
+    def write(self, record):
+        if record.get("ok") is False:
+            self.failed += 1
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+SHARD_DIR_SETTINGS = ("codewalker_output_dir", "blender_output_dir")
+
+
+def get_shard_settings(settings, shard):
+    """`settings` with the output directories moved to this shard's own subfolder."""
+    props = bpy.context.scene.cw_sollumz_props
+    settings = dict(settings)
+    for key in SHARD_DIR_SETTINGS:
+        settings[key] = os.path.join(settings.get(key, getattr(props, key)), f"shard{shard}")
+    return settings
+
+
+# === Import ===
+
+def resolve_import_paths(client, items, writer):
+    """Expand searches into paths; a failed search is written as a failed item."""
+    paths = []
+    for item in items:
+        if isinstance(item, str):
+            paths.append(item)
+            continue
+        try:
+            response = client.request("GET", "/search-file", params={"filename": item["search"]})
+            response.raise_for_status()
+            paths.extend(response.json()[:item.get("limit")])
+        except Exception as e:
+            writer.write({"type": "import", "item": item, "ok": False, "error": str(e)})
+    return paths
+
+
+def run_imports(props, items, writer):
+    client = get_client(props)
+    paths = resolve_import_paths(client, items, writer)
+    try:
+        batch = ImportBatch(props, paths)
+
+        # Same parallel chunked downloads as the batch import operator
+        jobs = batch.submit_downloads(client)
+        for (directory, chunk), job in zip(batch.chunks, jobs):
+            job.wait()
+            batch.complete_chunk(directory, chunk, job.error_message())
+        batch.import_all()
+    except Exception as e:
+        for path in paths:
+            writer.write({"type": "import", "path": path, "ok": False, "error": str(e)})
+        return 0
+
+    failed = dict(batch.errors)
+    for path in paths:
+        error = failed.get(path) or failed.get(os.path.basename(path.replace("\\", "/")) + ".xml")
+        writer.write({"type": "import", "path": path, "ok": error is None, "error": error})
+    return len(paths) - len(failed)
+
+
+# === Export ===
+
+def run_export(item, settings, writer):
+    bpy.ops.wm.open_mainfile(filepath=item["blend"])
+    # Opening a .blend resets the scene properties
+    apply_settings(settings)
+    context = bpy.context
+
+    if item.get("collection"):
+        collection = bpy.data.collections.get(item["collection"])
+        if collection is None:
+            writer.write({"type": "export", "item": item, "ok": False, "error": "collection not found"})
+            return 0
+        objects = collection.all_objects
+    else:
+        objects = context.scene.objects
+    roots = promote_to_root_objects(objects)
+
+    warnings = []
+    run = ExportRun(context, roots, lambda level, message: warnings.append(message))
+    while run.pending:
+        run.export_next(context)
+    while not run.uploader.done:
+        time.sleep(0.05)
+    run.save_manifest()
+
+    errors = warnings + run.uploader.errors
+    writer.write({
+        "type": "export",
+        "item": item,
+        "ok": not errors,
+        "objects": run.total,
+        "exported": run.exported,
+        "skipped": run.skipped,
+        "uploaded_files": run.uploader.uploaded_files,
+        "errors": errors,
+    })
+    return run.exported
+
+
+# === Shards ===
+
+def run_shard(args):
+    manifest, items = load_manifest(args.manifest)
+    shard, shard_count = (int(part) for part in args.shard.split("/"))
+    items = items[shard::shard_count]
+    settings = manifest.get("settings", {})
+    if shard_count > 1:
+        settings = get_shard_settings(settings, shard)
+    writer = ResultWriter(args.output)
+    started = time.monotonic()
+    imported = exported = 0
+
+    try:
+        imports = [item for kind, item in items if kind == "import"]
+        if imports:
+            props = apply_settings(settings)
+            imported = run_imports(props, imports, writer)
+            if manifest.get("import_save_as"):
+                root, ext = os.path.splitext(manifest["import_save_as"])
+                suffix = f"_shard{shard}" if shard_count > 1 else ""
+                bpy.ops.wm.save_as_mainfile(filepath=f"{root}{suffix}{ext}")
+
+        for kind, item in items:
+            if kind != "export":
+                continue
+            try:
+                exported += run_export(item, settings, writer)
+            except Exception as e:
+                writer.write({"type": "export", "item": item, "ok": False, "error": str(e)})
+    finally:
+        seconds = time.monotonic() - started
+        writer.write({
+            "type": "summary",
+            "shard": args.shard,
+            "items": len(items),
+            "imported": imported,
+            "exported": exported,
+            "failed": writer.failed,
+            "seconds": round(seconds, 3),
+            "items_per_second": round(len(items) / seconds, 3) if seconds else None,
+        })
+        writer.close()
+        if args.trace:
+            profiler.save(args.trace, 'CHROME')
+    return writer.failed
+
+
+def run_parallel(args):
+    """Start one background Blender per shard and merge their JSON lines."""
+    enabled_addons = ",".join(addon.module for addon in bpy.context.preferences.addons)
+    expression = f"from {__package__} import headless; headless.main()"
+    started = time.monotonic()
+
+    with tempfile.TemporaryDirectory(prefix="cw_sollumz_") as tmp_dir:
+        processes = []
+        for shard in range(args.jobs):
+            output = os.path.join(tmp_dir, f"shard{shard}.jsonl")
+            command = [
+                bpy.app.binary_path, "--background", "--addons", enabled_addons,
+                "--python-expr", expression, "--",
+                "--manifest", args.manifest, "--shard", f"{shard}/{args.jobs}", "--output", output,
+            ]
+            if args.trace:
+                root, ext = os.path.splitext(args.trace)
+                command += ["--trace", f"{root}_shard{shard}{ext}"]
+            processes.append((subprocess.Popen(command), output))
+
+        writer = ResultWriter(args.output)
+        totals = {"items": 0, "imported": 0, "exported": 0, "failed": 0}
+        for process, output in processes:
+            process.wait()
+            try:
+                with open(output, "r", encoding="utf-8") as f:
+                    records = [json.loads(line) for line in f if line.strip()]
+            except OSError:
+                records = [{"type": "shard", "ok": False, "error": f"exit code {process.returncode}, no output"}]
+            for record in records:
+                if record["type"] == "summary":
+                    for key in totals:
+                        totals[key] += record[key]
+                else:
+                    writer.write(record)
+
+    seconds = time.monotonic() - started
+    totals["failed"] = max(totals["failed"], writer.failed)
+    writer.write(dict(
+        {"type": "summary", "shard": f"all/{args.jobs}", "seconds": round(seconds, 3)},
+        items_per_second=round(totals["items"] / seconds, 3) if seconds else None,
+        **totals,
+    ))
+    writer.close()
+    return totals["failed"]
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    failed = run_parallel(args) if args.jobs > 1 else run_shard(args)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,224 @@
+import bpy
+import contextlib
+import threading
+import time
+
+import requests
+
+from .config_sync import forget_synced_config
+from .utils import get_api_base_url, redraw_view3d
+
+PROBE_TIMEOUT = 2.0
+OFFLINE_INTERVAL = 1.0
+WATCH_INTERVAL = 0.5
+MAX_QUEUED_OPERATIONS = 50
+
+_monitor = None
+# Operator calls deferred while the backend was unreachable, replayed in order
+_deferred = []
+
+
+class HealthMonitor:
+    """Poll CodeWalker.API on a background thread with short timeouts.
+
+    Keeps the connection state, round-trip latency and, once per (re)connect,
+    the backend version and capabilities. `/get-config` doubles as the probe
+    since every CodeWalker.API build has it; `/capabilities` is optional.
+    """
+
+    def __init__(self, port, interval):
+        self.port = port
+        self.interval = interval
+        self.state = 'UNKNOWN'
+        self.latency_ms = None
+        self.version = None
+        self.capabilities = {}
+        self.error = None
+        self.checked_at = 0.0
+        # Bumped whenever something shown in the panel changes
+        self.generation = 0
+        self._session = requests.Session()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="cw_sollumz_health", daemon=True)
+        self._thread.start()
+
+    @property
+    def available(self):
+        # Nothing is deferred before the first probe has answered
+        return self.state != 'OFFLINE'
+
+    def url(self, path):
+        return f"{get_api_base_url(self.port)}{path}"
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.probe()
+            self._stop.wait(self.interval if self.state == 'ONLINE' else OFFLINE_INTERVAL)
+        self._session.close()
+
+    def probe(self):
+        started = time.perf_counter()
+        try:
+            response = self._session.get(self.url("/get-config"), timeout=PROBE_TIMEOUT)
+            if response.status_code not in (200, 304):
+                raise RuntimeError(f"HTTP {response.status_code}")
+        except Exception as e:
+            self.checked_at = time.time()
+            if self.state != 'OFFLINE' or self.error != str(e):
+                self.state = 'OFFLINE'
+                self.error = str(e)
+                self.latency_ms = None
+                self.generation += 1
+            return
+
+        latency_ms = (time.perf_counter() - started) * 1000.0
+        reconnected = self.state != 'ONLINE'
+        if reconnected:
+            self.probe_capabilities(response)
+        # Small jitter does not need a redraw
+        changed = reconnected or self.latency_ms is None or abs(latency_ms - self.latency_ms) >= 1.0
+        self.checked_at = time.time()
+        self.error = None
+        # The panel reads these from the main thread as soon as it sees 'ONLINE'
+        self.latency_ms = latency_ms
+        self.state = 'ONLINE'
+        if changed:
+            self.generation += 1
+
+    def probe_capabilities(self, response):
+        self.version = response.headers.get("X-Api-Version") or response.headers.get("Server")
+        capabilities = {"etag": "ETag" in response.headers}
+        try:
+            extra = self._session.get(self.url("/capabilities"), timeout=PROBE_TIMEOUT)
+            if extra.status_code == 200:
+                capabilities.update(extra.json())
+        except Exception:
+            pass
+        self.capabilities = capabilities
+
+
+def get_health_monitor(props):
+    """Return the monitor for the configured port, restarting it when the port changes."""
+    global _monitor
+    if _monitor is None or _monitor.port != props.api_port:
+        if _monitor is not None:
+            _monitor.stop()
+        _monitor = HealthMonitor(props.api_port, props.health_check_interval)
+        if not bpy.app.timers.is_registered(_watch):
+            bpy.app.timers.register(_watch, first_interval=WATCH_INTERVAL, persistent=True)
+    _monitor.interval = props.health_check_interval
+    return _monitor
+
+
+def is_backend_available(props):
+    return get_health_monitor(props).available
+
+
+def backend_supports(props, capability):
+    """Whether the backend advertised `capability`; unknown until it has been probed."""
+    return get_health_monitor(props).capabilities.get(capability) is True
+
+
+# === Deferred operations ===
+
+def defer_operation(context, idname, properties=None):
+    """Queue `idname` to run with `properties` once the backend is reachable.
+
+    The selection and active object are captured now, so a queued export
+    still exports what was selected when it was requested.
+    """
+    entry = {
+        "idname": idname,
+        "properties": dict(properties or {}),
+        "scene": context.scene.name,
+        "selected": [obj.name for obj in (context.selected_objects or [])],
+        "active": context.active_object.name if context.active_object else None,
+    }
+    # Asking twice for the same thing while offline should only run it once
+    if entry not in _deferred:
+        _deferred.append(entry)
+        del _deferred[:-MAX_QUEUED_OPERATIONS]
+    return len(_deferred)
+
+
+def defer_if_offline(operator, context, **properties):
+    """Queue the operator instead of letting it fail; returns its result set, or None to go ahead."""
+    if is_backend_available(context.scene.cw_sollumz_props):
+        return None
+    count = defer_operation(context, operator.bl_idname, properties)
+    operator.report({'WARNING'}, f"Backend unreachable, {operator.bl_label} queued ({count} waiting).")
+    return {'FINISHED'}
+
+
+def get_deferred_operations():
+    return list(_deferred)
+
+
+def clear_deferred_operations():
+    _deferred.clear()
+
+
+def _context_override(entry):
+    overrides = {}
+    wm = bpy.context.window_manager
+    if wm.windows:
+        window = wm.windows[0]
+        overrides["window"] = window
+        area = next((a for a in window.screen.areas if a.type == 'VIEW_3D'), None)
+        if area is not None:
+            overrides["area"] = area
+            overrides["region"] = next((r for r in area.regions if r.type == 'WINDOW'), None)
+    scene = bpy.data.scenes.get(entry["scene"])
+    if scene is not None:
+        overrides["scene"] = scene
+    objects = [bpy.data.objects[name] for name in entry["selected"] if name in bpy.data.objects]
+    overrides["selected_objects"] = objects
+    overrides["active_object"] = bpy.data.objects.get(entry["active"]) if entry["active"] else None
+    return bpy.context.temp_override(**{k: v for k, v in overrides.items() if v is not None})
+
+
+def replay_deferred_operations():
+    while _deferred:
+        entry = _deferred.pop(0)
+        category, name = entry["idname"].split(".")
+        try:
+            with _context_override(entry) if bpy.context.window_manager.windows else contextlib.nullcontext():
+                getattr(getattr(bpy.ops, category), name)('INVOKE_DEFAULT', **entry["properties"])
+        except Exception as e:
+            print(f"[ERROR] Replaying queued {entry['idname']} failed: {e}")
+
+
+_seen_generation = None
+_seen_state = None
+
+
+def _watch():
+    """Main-thread side of the monitor: redraws, reconnect handling and replay."""
+    global _seen_generation, _seen_state
+    monitor = _monitor
+    if monitor is None:
+        return None
+    if monitor.generation != _seen_generation:
+        if monitor.state == 'ONLINE' and _seen_state == 'OFFLINE':
+            # A restarted backend may have come back with its stored config
+            forget_synced_config(monitor.port)
+        _seen_generation = monitor.generation
+        _seen_state = monitor.state
+        redraw_view3d()
+    if monitor.state == 'ONLINE' and _deferred:
+        replay_deferred_operations()
+    return WATCH_INTERVAL
+
+
+def unregister():
+    global _monitor, _seen_generation, _seen_state
+    if bpy.app.timers.is_registered(_watch):
+        bpy.app.timers.unregister(_watch)
+    if _monitor is not None:
+        _monitor.stop()
+    _monitor = None
+    _seen_generation = _seen_state = None
+    _deferred.clear()
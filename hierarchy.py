@@ -0,0 +1,170 @@
+import bpy
+from bpy.app.handlers import persistent
+
+_index = None
+
+
+class HierarchyIndex:
+    """Root -> descendants for every object in the file.
+
+    Built once on first use and then patched from `depsgraph_update_post`:
+    only objects the depsgraph reports as updated are checked, and only a
+    changed parent moves a subtree. Added or removed objects, undo and file
+    loads mark the index stale, and a lookup that finds a renamed or
+    reparented object in its answer rebuilds it, so a stale index is never
+    answered from. Finding roots stays a plain parent walk, which is already
+    as cheap as any check of the index would be.
+    """
+
+    def __init__(self):
+        self.objects = {}
+        self.parents = {}
+        self.children = {}
+        self.roots = {}
+        self.descendants = {}
+        self.count = -1
+        self.stale = True
+
+    def rebuild(self):
+        self.objects = {obj.name_full: obj for obj in bpy.data.objects}
+        self.parents = {
+            name: obj.parent.name_full if obj.parent is not None else None
+            for name, obj in self.objects.items()
+        }
+        self.children = {name: set() for name in self.objects}
+        for name, parent in self.parents.items():
+            if parent is not None:
+                self.children[parent].add(name)
+
+        self.roots = {}
+        self.descendants = {}
+        for name, parent in self.parents.items():
+            if parent is None:
+                self.roots[name] = name
+                subtree = self.subtree(name)
+                self.descendants[name] = subtree
+                for child in subtree:
+                    self.roots[child] = name
+        self.count = len(bpy.data.objects)
+        self.stale = False
+
+    def subtree(self, name):
+        """Names below `name`, without `name` itself."""
+        result = set()
+        pending = list(self.children[name])
+        while pending:
+            child = pending.pop()
+            result.add(child)
+            pending.extend(self.children[child])
+        return result
+
+    def ensure(self):
+        if self.stale or self.count != len(bpy.data.objects):
+            self.rebuild()
+
+    def _parent_matches(self, obj):
+        name = obj.name_full
+        if name not in self.parents:
+            return False
+        parent = obj.parent.name_full if obj.parent is not None else None
+        return self.parents[name] == parent
+
+    def refresh(self, obj):
+        """Move `obj`'s subtree if the depsgraph update changed its parent."""
+        name = obj.name_full
+        if name not in self.parents:
+            self.stale = True
+            return
+        new_parent = obj.parent.name_full if obj.parent is not None else None
+        old_parent = self.parents[name]
+        if new_parent == old_parent:
+            return
+        if new_parent is not None and new_parent not in self.parents:
+            self.stale = True
+            return
+
+        moved = self.subtree(name) | {name}
+        old_root = self.roots[name]
+        if old_root == name:
+            del self.descendants[name]
+        else:
+            self.descendants[old_root] -= moved
+            self.children[old_parent].discard(name)
+
+        self.parents[name] = new_parent
+        if new_parent is None:
+            new_root = name
+            self.descendants[name] = moved - {name}
+        else:
+            self.children[new_parent].add(name)
+            new_root = self.roots[new_parent]
+            self.descendants[new_root] |= moved
+        for moved_name in moved:
+            self.roots[moved_name] = new_root
+
+    def descendants_of(self, root):
+        self.ensure()
+        if not self._parent_matches(root) or not self._subtree_matches(root.name_full):
+            self.rebuild()
+        return [self.objects[name] for name in self.descendants.get(root.name_full, ())]
+
+    def _subtree_matches(self, name):
+        # Same size as the answer, so checking every cached link costs nothing extra
+        for child in self.descendants.get(name, ()):
+            obj = self.objects[child]
+            try:
+                parent = obj.parent.name_full if obj.parent is not None else None
+                if obj.name_full != child or self.parents[child] != parent:
+                    return False
+            except ReferenceError:
+                # Deleted since the last rebuild
+                return False
+        return True
+
+
+def get_hierarchy_index():
+    global _index
+    if _index is None:
+        _index = HierarchyIndex()
+    return _index
+
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    index = _index
+    if index is None or index.stale:
+        return
+    if index.count != len(bpy.data.objects):
+        index.stale = True
+        return
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Object):
+            index.refresh(update.id.original)
+            if index.stale:
+                return
+
+
+@persistent
+def _mark_stale(*_args):
+    if _index is not None:
+        _index.stale = True
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+    bpy.app.handlers.undo_post.append(_mark_stale)
+    bpy.app.handlers.redo_post.append(_mark_stale)
+    bpy.app.handlers.load_post.append(_mark_stale)
+
+
+def unregister():
+    global _index
+    for handlers, handler in (
+        (bpy.app.handlers.depsgraph_update_post, _on_depsgraph_update),
+        (bpy.app.handlers.undo_post, _mark_stale),
+        (bpy.app.handlers.redo_post, _mark_stale),
+        (bpy.app.handlers.load_post, _mark_stale),
+    ):
+        if handler in handlers:
+            handlers.remove(handler)
+    _index = None
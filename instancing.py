@@ -0,0 +1,105 @@
+import bpy
+
+from .cache import AssetCache, get_xml_name
+from .utils import get_descendants
+
+RPF_PATH_PROP = "cw_rpf_path"
+
+# rpf key -> names of root objects imported from that RPF entry
+_registry = {}
+# (blend file, object count) the registry was last built for
+_registry_stamp = None
+
+
+def _stamp():
+    return (bpy.data.filepath, len(bpy.data.objects))
+
+
+def _rebuild():
+    global _registry_stamp
+    _registry.clear()
+    for obj in bpy.data.objects:
+        path = obj.get(RPF_PATH_PROP)
+        if isinstance(path, str) and (obj.parent is None or obj.parent.get(RPF_PATH_PROP) is None):
+            _registry.setdefault(AssetCache.entry_key(path), []).append(obj.name)
+    _registry_stamp = _stamp()
+
+
+def register_asset(rpf_path, objects):
+    """Tag the roots among freshly imported `objects` with the RPF entry they came from."""
+    imported = set(objects)
+    roots = [obj for obj in objects if obj.parent not in imported]
+    for obj in roots:
+        # Linked library objects can't be tagged, the registry still knows them
+        if obj.library is None:
+            obj[RPF_PATH_PROP] = rpf_path
+    global _registry_stamp
+    if _registry_stamp is None or _registry_stamp[0] != bpy.data.filepath:
+        _rebuild()
+    names = _registry.setdefault(AssetCache.entry_key(rpf_path), [])
+    names.extend(obj.name for obj in roots if obj.name not in names)
+    # The new objects are accounted for; anything else added in between is
+    # only found after the next count change, which costs an import, not a wrong answer
+    _registry_stamp = _stamp()
+
+
+def find_instance_source(rpf_path):
+    """Return a root object already imported from `rpf_path`, or None."""
+    if _registry_stamp != _stamp():
+        _rebuild()
+    key = AssetCache.entry_key(rpf_path)
+    for name in _registry.get(key, ()):
+        obj = bpy.data.objects.get(name)
+        # Renamed or deleted since the registry was built
+        if obj is not None and (obj.library is not None or AssetCache.entry_key(obj.get(RPF_PATH_PROP, "")) == key):
+            return obj
+    return None
+
+
+def instance_asset(rpf_path, collection):
+    """Place another copy of an already imported asset that shares its mesh data.
+
+    Every object of the source hierarchy becomes a linked duplicate: meshes,
+    materials and images are not copied, so repeated placements of the same
+    prop cost one copy of the geometry. Parents, armature modifiers and
+    constraint targets are pointed at the new copies. Returns the new
+    objects, root first, or None if the asset is not in the file.
+    """
+    source = find_instance_source(rpf_path)
+    if source is None:
+        return None
+    hierarchy = [source] + get_descendants(source)
+    copies = {}
+    for obj in hierarchy:
+        copy = obj.copy()
+        copies[obj] = copy
+        collection.objects.link(copy)
+
+    for obj, copy in copies.items():
+        if obj.parent in copies:
+            copy.parent = copies[obj.parent]
+        for modifier in copy.modifiers:
+            if getattr(modifier, "object", None) in copies:
+                modifier.object = copies[modifier.object]
+        for constraint in copy.constraints:
+            if getattr(constraint, "target", None) in copies:
+                constraint.target = copies[constraint.target]
+
+    objects = list(copies.values())
+    register_asset(rpf_path, objects)
+    return objects
+
+
+def register_batch(paths, groups):
+    """Register the per-file object groups of a batch import (see `split_by_asset`)."""
+    paths_by_file = {get_xml_name(path).lower(): path for path in paths}
+    for file_name, objects in groups.items():
+        path = paths_by_file.get(file_name.lower())
+        if path is not None:
+            register_asset(path, objects)
+
+
+def unregister():
+    global _registry_stamp
+    _registry.clear()
+    _registry_stamp = None
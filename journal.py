@@ -0,0 +1,180 @@
+import json
+import os
+import threading
+import time
+import uuid
+
+JOURNAL_DIR_NAME = ".cw_journal"
+
+
+def get_journal_dir(output_dir):
+    return os.path.join(output_dir, JOURNAL_DIR_NAME)
+
+
+class ExportJournal:
+    """Append-only JSON-lines log of one export run in `blender_output_dir`.
+
+    Every exported object, batched YTYP and upload outcome is one line, so
+    after a crash or a failed push `load_unfinished` can tell which objects
+    still need exporting and which exported files still need uploading.
+    Each run writes its own file, named after the run id, so headless shards
+    and queued exports sharing an output folder don't overwrite each other;
+    a run that finishes removes its file.
+    """
+
+    def __init__(self, output_dir, run_id=None):
+        self.output_dir = output_dir
+        self.run_id = run_id or uuid.uuid4().hex
+        self.path = os.path.join(get_journal_dir(output_dir), f"{self.run_id}.jsonl")
+        self._lock = threading.Lock()
+        if run_id is not None:
+            self._end_torn_line()
+
+    def _end_torn_line(self):
+        # A crash mid-write leaves a partial last line; new records must not be appended to it
+        try:
+            with open(self.path, "rb+") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+        except OSError:
+            pass
+
+    def start(self, target, objects, since, blend=""):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._discard_superseded(target, objects, blend)
+        with self._lock, open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self._entry("start", target=target, objects=objects, since=since, blend=blend)) + "\n")
+
+    def _discard_superseded(self, target, objects, blend):
+        # A fresh export of the same objects to the same target replaces an interrupted one
+        names = set(objects)
+        for run_id, records in _read_runs(self.output_dir):
+            start = records[0]
+            if (start["target"] == target and start.get("blend", "") == blend
+                    and set(start["objects"]) <= names):
+                _remove_run(self.output_dir, run_id)
+
+    def _entry(self, event, **fields):
+        return dict(run=self.run_id, event=event, time=time.time(), **fields)
+
+    def record(self, event, durable=False, **fields):
+        line = json.dumps(self._entry(event, **fields)) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def finish(self):
+        # Marked first, in case the file can't be removed right now
+        self.record("finished", durable=True)
+        with self._lock:
+            _remove_run(self.output_dir, self.run_id)
+
+    @staticmethod
+    def read(output_dir, run_id):
+        """Return the records of run `run_id`; a torn last line from a crash is ignored."""
+        records = []
+        try:
+            with open(os.path.join(get_journal_dir(output_dir), f"{run_id}.jsonl"), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get("run") == run_id:
+                        records.append(record)
+        except OSError:
+            return []
+        return records
+
+    @classmethod
+    def load_unfinished(cls, output_dir):
+        """Summarize the latest interrupted run, or return None if every run completed."""
+        runs = _read_runs(output_dir)
+        if not runs:
+            return None
+        records = max(runs, key=lambda run: run[1][0]["time"])[1]
+        start = records[0]
+        state = {
+            "run": start["run"],
+            "target": start["target"],
+            "since": start["since"],
+            "objects": start["objects"],
+            # name -> {"canonical", "fingerprint"}
+            "exported": {},
+            "ytyp": set(),
+            "uploaded": set(),
+        }
+        for record in records[1:]:
+            if record["event"] == "exported":
+                state["exported"][record["object"]] = {
+                    "canonical": record["canonical"],
+                    "fingerprint": record.get("fingerprint"),
+                }
+            elif record["event"] == "ytyp":
+                state["ytyp"].add(record["group"])
+            elif record["event"] == "uploaded":
+                state["uploaded"].update(record["names"])
+        return state
+
+
+def _run_ids(output_dir):
+    try:
+        names = os.listdir(get_journal_dir(output_dir))
+    except OSError:
+        return []
+    return [name[:-len(".jsonl")] for name in names if name.endswith(".jsonl")]
+
+
+def _read_runs(output_dir):
+    """`(run id, records)` of every unfinished run with a readable start record."""
+    runs = []
+    for run_id in _run_ids(output_dir):
+        records = ExportJournal.read(output_dir, run_id)
+        if records and records[0]["event"] == "start" and records[-1]["event"] != "finished":
+            runs.append((run_id, records))
+    return runs
+
+
+def _remove_run(output_dir, run_id):
+    try:
+        os.remove(os.path.join(get_journal_dir(output_dir), f"{run_id}.jsonl"))
+    except OSError:
+        pass
+
+
+_peek_cache = {}
+
+
+def peek_unfinished(output_dir):
+    """`(remaining objects, exported but not uploaded)` of the latest interrupted run, cached by file stats for drawing."""
+    directory = get_journal_dir(output_dir)
+    key = []
+    for run_id in _run_ids(output_dir):
+        try:
+            stat = os.stat(os.path.join(directory, f"{run_id}.jsonl"))
+        except OSError:
+            continue
+        key.append((run_id, stat.st_mtime_ns, stat.st_size))
+    if not key:
+        return None
+    key = tuple(sorted(key))
+    cached = _peek_cache.get(directory)
+    if cached is None or cached[0] != key:
+        state = ExportJournal.load_unfinished(output_dir)
+        summary = None
+        if state is not None:
+            exported = state["exported"]
+            # Duplicates are pushed through the object their asset was staged for
+            pushed = {exported[name]["canonical"] for name in state["uploaded"] if name in exported}
+            summary = (
+                len(set(state["objects"]) - set(exported)),
+                sum(1 for entry in exported.values() if entry["canonical"] not in pushed),
+            )
+        cached = _peek_cache[directory] = (key, summary)
+    return cached[1]
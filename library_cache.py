@@ -0,0 +1,199 @@
+import bpy
+import hashlib
+import json
+import os
+import re
+import time
+
+from .cache import AssetCache, get_asset_cache, get_texture_dir_name, get_xml_name
+from .profiling import span
+
+LIBRARY_DIR_NAME = ".cw_library"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+_libraries = {}
+
+# Blender's ".001" style suffix for names that were already taken
+_DUPLICATE_SUFFIX = re.compile(r"\.\d{3,}$")
+
+
+class LibraryCache:
+    """Per-asset .blend files holding what the Sollumz import built from an XML.
+
+    The first import of an RPF entry writes its objects (with their meshes,
+    materials and images) to a .blend in the asset cache; later imports append
+    or link them with `bpy.data.libraries.load` instead of parsing the XML again.
+    Entries are validated like the XML cache, against the source archive's
+    size/mtime, and images keep absolute paths into the cached texture folders,
+    so an entry whose textures were evicted is dropped as well.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.directory = os.path.join(cache_dir, LIBRARY_DIR_NAME)
+        self.manifest_path = os.path.join(self.directory, MANIFEST_NAME)
+        self.max_bytes = max_bytes
+        self.entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                return manifest.get("entries", {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "entries": self.entries}, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def blend_name(self, rpf_path):
+        # Same file names exist in many archives, the hash keeps them apart
+        digest = hashlib.blake2b(AssetCache.entry_key(rpf_path).encode("utf-8"), digest_size=6).hexdigest()
+        return f"{get_texture_dir_name(get_xml_name(rpf_path))}_{digest}.blend"
+
+    def lookup(self, rpf_path, signature):
+        """Return the .blend path for `rpf_path`, or None on a miss."""
+        if signature is None:
+            return None
+        key = AssetCache.entry_key(rpf_path)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        path = os.path.join(self.directory, entry["file"])
+        if (entry["signature"] != signature or not os.path.isfile(path)
+                or (entry["textures"] and not os.path.isdir(entry["textures"]))):
+            self._remove(key)
+            self.save()
+            return None
+        return path
+
+    def store(self, rpf_path, signature, objects, texture_dir=None):
+        """Write `objects` and everything they use to the asset's .blend."""
+        if signature is None or not objects:
+            return False
+        os.makedirs(self.directory, exist_ok=True)
+        file_name = self.blend_name(rpf_path)
+        path = os.path.join(self.directory, file_name)
+        tmp_path = path + ".tmp.blend"
+        try:
+            with span("library write", count=len(objects)):
+                bpy.data.libraries.write(tmp_path, set(objects), path_remap='ABSOLUTE', fake_user=True, compress=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"[ERROR] Writing library cache for {rpf_path} failed: {e}")
+            return False
+
+        key = AssetCache.entry_key(rpf_path)
+        self.entries[key] = {
+            "file": file_name,
+            "textures": texture_dir if texture_dir and os.path.isdir(texture_dir) else None,
+            "signature": signature,
+            "bytes": os.path.getsize(path),
+            "last_access": time.time(),
+        }
+        self.evict(keep=key)
+        self.save()
+        return True
+
+    def load(self, rpf_path, signature, collection, link=False):
+        """Append (or link) the cached objects of `rpf_path` into `collection`; None on a miss."""
+        path = self.lookup(rpf_path, signature)
+        if path is None:
+            return None
+        try:
+            with span("library load", count=1, link=link):
+                with bpy.data.libraries.load(path, link=link) as (data_from, data_to):
+                    data_to.objects = data_from.objects
+                objects = [obj for obj in data_to.objects if obj is not None]
+                for obj in objects:
+                    # Linked objects are shared, a second import finds them already there
+                    if collection.objects.get(obj.name) is not obj:
+                        collection.objects.link(obj)
+        except Exception as e:
+            print(f"[ERROR] Loading library cache for {rpf_path} failed: {e}")
+            self._remove(AssetCache.entry_key(rpf_path))
+            self.save()
+            return None
+        self.entries[AssetCache.entry_key(rpf_path)]["last_access"] = time.time()
+        self.save()
+        return objects
+
+    def total_bytes(self):
+        return sum(entry["bytes"] for entry in self.entries.values())
+
+    def evict(self, keep=None):
+        """Drop least recently used entries until the library fits `max_bytes`."""
+        # Files linked into the open .blend must stay where they are
+        linked = {os.path.normcase(bpy.path.abspath(library.filepath)) for library in bpy.data.libraries}
+        total = self.total_bytes()
+        for key in sorted(self.entries, key=lambda k: self.entries[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep or os.path.normcase(os.path.join(self.directory, self.entries[key]["file"])) in linked:
+                continue
+            total -= self.entries[key]["bytes"]
+            self._remove(key)
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        try:
+            os.remove(os.path.join(self.directory, entry["file"]))
+        except OSError:
+            pass
+
+    def clear(self):
+        self.entries = {}
+
+
+def get_library_cache(props):
+    """Return the library next to the asset cache, or None unless both are enabled."""
+    if not props.use_library_cache:
+        return None
+    cache = get_asset_cache(props)
+    if cache is None:
+        return None
+    library = _libraries.get(cache.directory)
+    if library is None:
+        library = _libraries[cache.directory] = LibraryCache(cache.directory, 0)
+    library.max_bytes = props.cache_size_mb * 1024 * 1024
+    return library
+
+
+def get_object_names():
+    return set(bpy.data.objects.keys())
+
+
+def get_new_objects(names_before):
+    return [obj for obj in bpy.data.objects if obj.name not in names_before and obj.library is None]
+
+
+def split_by_asset(objects, file_names):
+    """Group freshly imported objects by the XML they came from.
+
+    Sollumz names every root object after the file stem, so a batch import
+    can be split back into per-asset hierarchies. Roots that match no file
+    are left out.
+    """
+    stems = {get_texture_dir_name(name).lower(): name for name in file_names}
+    imported = set(objects)
+    groups = {}
+    for obj in objects:
+        root = obj
+        while root.parent is not None and root.parent in imported:
+            root = root.parent
+        file_name = stems.get(_DUPLICATE_SUFFIX.sub("", root.name).lower())
+        if file_name is not None:
+            groups.setdefault(file_name, []).append(obj)
+    return groups
+
+
+def unregister():
+    _libraries.clear()
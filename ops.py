@@ -1,34 +1,148 @@
 import bpy
 import os
-import requests
+import time
 from bpy.types import Operator
 from bpy.props import BoolProperty, StringProperty
+from .cache import get_asset_cache, get_source_signature, get_texture_dir_name, get_xml_name
+from .client import get_client
+from .config_sync import schedule_push, submit_pull, submit_push
+from .instancing import instance_asset, register_asset
+from .journal import ExportJournal
+from .library_cache import get_library_cache, get_new_objects, get_object_names
+from .health import clear_deferred_operations, defer_if_offline, defer_operation, is_backend_available
+from .pipeline import ExportRun, ImportBatch, get_export_target
+from .prefetch import get_prefetch_job
+from .previews import reset_previews
+from .profiling import profiler, span
+from .results import get_result_store, get_selected_paths
+from .search import cancel_search, load_more, run_local_search, start_search
+from .search_index import get_local_index
+from .transport import submit_download
 from .utils import (
-    get_api_base_url,
     promote_to_root_objects,
-    get_canonical_object_name,
-    DEFAULT_EQUIVALENCE_PROFILE,
+    select_only,
+    get_ytyp_groups,
+    build_ytyp_index,
+    export_ytyp_group,
 )
 from .props import CW_Sollumz_Properties
 
-class PullBackendConfigOperator(Operator):
+
+class BackgroundJobMixin:
+    """Wait for background client jobs from `modal` so the UI stays responsive.
+
+    Operators call `start_job`/`start_jobs` from `execute` and override
+    `finish_job` (or `finish_jobs` for several jobs), which runs on the main
+    thread once every request has completed; the default only reports the
+    outcome. ESC cancels, except for jobs in
+    `_shared_jobs` that other code is still waiting for.
+    """
+
+    _jobs = ()
+    _shared_jobs = ()
+    _timer = None
+    _status = ""
+    _started = 0.0
+
+    def start_job(self, context, job, status):
+        return self.start_jobs(context, [job], status)
+
+    def start_jobs(self, context, jobs, status, interval=0.1):
+        self._jobs = list(jobs)
+        self._status = status
+        self._started = time.monotonic()
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(interval, window=context.window)
+        wm.modal_handler_add(self)
+        if len(self._jobs) > 1:
+            wm.progress_begin(0, len(self._jobs))
+        self.update_status(context)
+        return {'RUNNING_MODAL'}
+
+    def update_status(self, context):
+        elapsed = time.monotonic() - self._started
+        text = f"{self._status} ({elapsed:.1f}s) - ESC to cancel"
+        if len(self._jobs) > 1:
+            done = sum(1 for job in self._jobs if job.done)
+            context.window_manager.progress_update(done)
+            text = f"{self._status} [{done}/{len(self._jobs)}] ({elapsed:.1f}s) - ESC to cancel"
+        context.workspace.status_text_set(text)
+
+    def stop_job(self, context):
+        wm = context.window_manager
+        if self._timer is not None:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+        if len(self._jobs) > 1:
+            wm.progress_end()
+        context.workspace.status_text_set(None)
+
+    def modal(self, context, event):
+        if event.type == 'ESC' and event.value == 'PRESS':
+            for job in self._jobs:
+                if job not in self._shared_jobs:
+                    job.cancel()
+            self.stop_job(context)
+            self.on_cancel(context)
+            self.report({'WARNING'}, f"{self.bl_label} cancelled.")
+            return {'CANCELLED'}
+
+        if event.type == 'TIMER':
+            self.tick(context)
+            if not all(job.done for job in self._jobs):
+                self.update_status(context)
+                return {'RUNNING_MODAL'}
+            self.stop_job(context)
+            return self.finish_jobs(context, self._jobs)
+
+        return {'PASS_THROUGH'}
+
+    def tick(self, context):
+        """Main-thread work to interleave with the jobs, called on every timer event."""
+
+    def on_cancel(self, context):
+        """Called after the jobs were cancelled with ESC."""
+
+    def finish_jobs(self, context, jobs):
+        return self.finish_job(context, jobs[0])
+
+    def finish_job(self, context, job):
+        """Report the request's error, if any; override to use its result."""
+        error = job.error_message()
+        if error:
+            self.report({'ERROR'}, f"{self.bl_label} failed: {error}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"{self.bl_label} finished.")
+        return {'FINISHED'}
+
+
+class PullBackendConfigOperator(BackgroundJobMixin, Operator):
     bl_idname = "cw_sollumz.pull_config"
     bl_label = "Pull Config from Backend"
 
     def execute(self, context):
         props = context.scene.cw_sollumz_props
+        deferred = defer_if_offline(self, context)
+        if deferred:
+            return deferred
+        job = submit_pull(props)
+        return self.start_job(context, job, "Pulling config")
+
+    def finish_job(self, context, job):
+        props = context.scene.cw_sollumz_props
+        error = job.error_message()
+        if error:
+            self.report({'ERROR'}, f"Failed to fetch config: {error}")
+            return {'CANCELLED'}
         try:
-            response = requests.get(f"{get_api_base_url(props.api_port)}/get-config")
-            if response.status_code == 200:
-                config = response.json()
-                props.codewalker_output_dir = config.get("codewalkerOutputDir", props.codewalker_output_dir)
-                props.blender_output_dir = config.get("blenderOutputDir", props.blender_output_dir)
-                props.fivem_output_dir = config.get("fivemOutputDir", props.fivem_output_dir)
-                props.rpf_path = config.get("rpfArchivePath", props.rpf_path)
-                props.gtapath = config.get("GTAPath", props.gtapath)
-                self.report({'INFO'}, "Configuration pulled from backend.")
-            else:
-                self.report({'ERROR'}, f"Failed to fetch config: {response.status_code}")
+            # Applied even when unchanged, since local edits may differ from the backend
+            config, changed = job.result
+            props.codewalker_output_dir = config.get("codewalkerOutputDir", props.codewalker_output_dir)
+            props.blender_output_dir = config.get("blenderOutputDir", props.blender_output_dir)
+            props.fivem_output_dir = config.get("fivemOutputDir", props.fivem_output_dir)
+            props.rpf_path = config.get("rpfArchivePath", props.rpf_path)
+            props.gtapath = config.get("GTAPath", props.gtapath)
+            self.report({'INFO'}, "Configuration pulled from backend." if changed else "Backend configuration unchanged.")
         except Exception as e:
             self.report({'ERROR'}, f"Fetch failed: {str(e)}")
         return {'FINISHED'}
@@ -43,51 +157,232 @@ class SearchFileOperator(Operator):
             self.report({'WARNING'}, "Please enter a filename to search.")
             return {'CANCELLED'}
 
-        try:
-            response = requests.get(f"{get_api_base_url(props.api_port)}/search-file", params={"filename": props.search_filename})
-            if response.status_code == 200:
-                results = response.json()
-                props.search_results.clear()
-                for result in results:
-                    item = props.search_results.add()
-                    item.name = result
-                self.report({'INFO'}, f"Found {len(results)} files.")
-            else:
-                self.report({'ERROR'}, f"Search failed: {response.status_code}")
-        except Exception as e:
-            self.report({'ERROR'}, f"Request failed: {str(e)}")
+        index = get_local_index(props)
+        if index is not None and index.loaded:
+            count = run_local_search(context.scene, index)
+            self.report({'INFO'}, f"Found {count} files (local index).")
+            return {'FINISHED'}
+
+        deferred = defer_if_offline(self, context)
+        if deferred:
+            return deferred
+        start_search(context.scene)
+        return {'FINISHED'}
+
+class RefreshSearchIndexOperator(Operator):
+    bl_idname = "cw_sollumz.refresh_search_index"
+    bl_label = "Rebuild Search Index"
+
+    def execute(self, context):
+        props = context.scene.cw_sollumz_props
+        index = get_local_index(props)
+        if index is None:
+            self.report({'WARNING'}, "Local search index is disabled.")
+            return {'CANCELLED'}
+        index.refresh(props, force=True)
+        self.report({'INFO'}, "Rebuilding search index in the background.")
         return {'FINISHED'}
 
-class ImportFileOperator(Operator):
+class LoadMoreResultsOperator(Operator):
+    bl_idname = "cw_sollumz.load_more_results"
+    bl_label = "Load More"
+
+    def execute(self, context):
+        if not load_more(context.scene):
+            self.report({'WARNING'}, "No more results to load.")
+            return {'CANCELLED'}
+        return {'FINISHED'}
+
+class CancelSearchOperator(Operator):
+    bl_idname = "cw_sollumz.cancel_search"
+    bl_label = "Cancel Search"
+
+    def execute(self, context):
+        cancel_search()
+        return {'FINISHED'}
+
+class ImportFileOperator(BackgroundJobMixin, Operator):
     bl_idname = "cw_sollumz.import_file"
     bl_label = "Import Selected File"
 
     index: bpy.props.IntProperty()
+    # Set instead of `index` by queued imports, since the results may change meanwhile
+    path: StringProperty(options={'HIDDEN', 'SKIP_SAVE'})
 
     def execute(self, context):
         props = context.scene.cw_sollumz_props
-        if self.index >= len(props.search_results):
+        store = get_result_store()
+        if not self.path and self.index >= len(store):
             self.report({'ERROR'}, "Invalid index.")
             return {'CANCELLED'}
 
-        selected_path = props.search_results[self.index].name
+        self._selected_path = self.path or store[self.index]
+        self._file_name = get_xml_name(self._selected_path)
+        self._directory = props.codewalker_output_dir
+        self._cache = get_asset_cache(props)
+        self._library = get_library_cache(props)
+        self._signature = None
+
+        # === Assets already in the file only get another placement ===
+        if props.instance_imports:
+            objects = instance_asset(self._selected_path, context.collection)
+            if objects is not None:
+                select_only(context, objects)
+                self.report({'INFO'}, "Import completed (instanced).")
+                return {'FINISHED'}
+
+        # === Serve from the local cache when the source archive is unchanged ===
+        if self._cache is not None:
+            self._signature = get_source_signature(props.gtapath, self._selected_path)
+            if self._library is not None:
+                objects = self._library.load(self._selected_path, self._signature, context.collection, link=props.library_link)
+                if objects is not None:
+                    register_asset(self._selected_path, objects)
+                    self.report({'INFO'}, "Import completed (library).")
+                    return {'FINISHED'}
+            cached_name = self._cache.lookup(self._selected_path, self._signature)
+            if cached_name:
+                self._directory = self._cache.directory
+                self._file_name = cached_name
+                return self.import_downloaded(context, cached=True)
+            if self._signature is not None:
+                self._directory = self._cache.ensure_directory()
+
+        deferred = defer_if_offline(self, context, path=self._selected_path)
+        if deferred:
+            return deferred
+
+        # A running prefetch of the same file is already writing it into the cache
+        into_cache = self._cache is not None and self._directory == self._cache.directory
+        job = get_prefetch_job(context.scene, self._selected_path) if into_cache else None
+        if job is not None:
+            # ESC only stops waiting; the prefetcher still needs its callback
+            self._shared_jobs = [job]
+        else:
+            if into_cache:
+                self._cache.prepare_download([self._selected_path])
+            job = submit_download(get_client(props), props.transport_mode, [self._selected_path], self._directory)
+        return self.start_job(context, job, f"Downloading {os.path.basename(self._selected_path)}")
+
+    def finish_job(self, context, job):
+        error = job.error_message()
+        if error:
+            self.report({'ERROR'}, f"Import failed: {error}")
+            return {'CANCELLED'}
+        if self._cache is not None and self._directory == self._cache.directory:
+            self._cache.store(self._selected_path, self._signature)
+        return self.import_downloaded(context)
+
+    def import_downloaded(self, context, cached=False):
         try:
-            response = requests.get(f"{get_api_base_url(props.api_port)}/download-files", params={
-                "fullPaths": selected_path,
-                "xml": "true",
-                "outputFolderPath": props.codewalker_output_dir
-            })
-            if response.status_code == 200:
-                file_name = os.path.basename(selected_path) + ".xml"
-                result = bpy.ops.sollumz.import_assets(directory=props.codewalker_output_dir, files=[{"name": file_name}])
-                if result == {'FINISHED'}:
-                    self.report({'INFO'}, "Import completed.")
-            else:
-                self.report({'ERROR'}, f"Import failed: {response.status_code}")
+            names_before = get_object_names()
+            with span("sollumz.import_assets", count=1, cached=cached):
+                result = bpy.ops.sollumz.import_assets(directory=self._directory, files=[{"name": self._file_name}])
+            if result == {'FINISHED'}:
+                objects = get_new_objects(names_before)
+                register_asset(self._selected_path, objects)
+                # Next time this asset is appended from a .blend instead of parsed again
+                if self._library is not None and self._cache is not None and self._directory == self._cache.directory:
+                    texture_dir = os.path.join(self._directory, get_texture_dir_name(self._file_name))
+                    self._library.store(self._selected_path, self._signature, objects, texture_dir)
+                self.report({'INFO'}, "Import completed (cached)." if cached else "Import completed.")
         except Exception as e:
             self.report({'ERROR'}, f"Import failed: {str(e)}")
         return {'FINISHED'}
-    
+
+class SelectSearchResultsOperator(Operator):
+    bl_idname = "cw_sollumz.select_results"
+    bl_label = "Select Search Results"
+
+    action: bpy.props.EnumProperty(
+        items=[
+            ('SELECT', "Select All", "Select all search results"),
+            ('DESELECT', "Deselect All", "Deselect all search results"),
+            ('INVERT', "Invert", "Invert the selection"),
+        ],
+        default='SELECT'
+    )
+
+    def execute(self, context):
+        items = context.window_manager.cw_sollumz_results
+        flags = [self.action == 'SELECT'] * len(items)
+        if self.action == 'INVERT':
+            items.foreach_get("selected", flags)
+            flags = [not flag for flag in flags]
+        items.foreach_set("selected", flags)
+        return {'FINISHED'}
+
+class BatchImportOperator(BackgroundJobMixin, Operator):
+    bl_idname = "cw_sollumz.import_selected"
+    bl_label = "Import Selected Files"
+
+    # Newline separated RPF paths, set by queued imports instead of the selection
+    paths: StringProperty(options={'HIDDEN', 'SKIP_SAVE'})
+
+    def execute(self, context):
+        props = context.scene.cw_sollumz_props
+        paths = self.paths.splitlines() if self.paths else get_selected_paths(context.window_manager)
+        if not paths:
+            self.report({'WARNING'}, "No search results selected.")
+            return {'CANCELLED'}
+
+        self._batch = ImportBatch(props, paths)
+        if not self._batch.chunks:
+            return self.import_batch(context)
+
+        deferred = defer_if_offline(self, context, paths="\n".join(paths))
+        if deferred:
+            return deferred
+
+        # === Download in chunks, all chunks run in parallel on the client pool ===
+        jobs = self._batch.submit_downloads(get_client(props))
+        return self.start_jobs(context, jobs, f"Downloading {self._batch.download_count} file(s)")
+
+    def finish_jobs(self, context, jobs):
+        for (directory, chunk), job in zip(self._batch.chunks, jobs):
+            self._batch.complete_chunk(directory, chunk, job.error_message())
+        return self.import_batch(context)
+
+    def import_batch(self, context):
+        batch = self._batch
+        if not batch.imports and not batch.library_hits and not batch.instances:
+            for path, error in batch.errors:
+                print(f"[ERROR] Batch import: {path}: {error}")
+            self.report({'ERROR'}, f"Batch import failed for all {len(batch.errors)} file(s), see console.")
+            return {'CANCELLED'}
+
+        imported = batch.import_all()
+        for path, error in batch.errors:
+            print(f"[ERROR] Batch import: {path}: {error}")
+
+        if imported == 0:
+            self.report({'ERROR'}, "Sollumz import failed, see console.")
+            return {'CANCELLED'}
+
+        if batch.errors:
+            self.report({'WARNING'}, f"Imported {imported} file(s), {len(batch.errors)} failed (see console).")
+        else:
+            self.report({'INFO'}, f"Imported {imported} file(s).")
+        return {'FINISHED'}
+
+class ClearAssetCacheOperator(Operator):
+    bl_idname = "cw_sollumz.clear_cache"
+    bl_label = "Clear Asset Cache"
+
+    def execute(self, context):
+        props = context.scene.cw_sollumz_props
+        cache = get_asset_cache(props)
+        if cache is None:
+            self.report({'WARNING'}, "Asset cache is disabled.")
+            return {'CANCELLED'}
+        library = get_library_cache(props)
+        if library is not None:
+            library.clear()
+        cache.clear()
+        reset_previews()
+        self.report({'INFO'}, "Asset cache cleared.")
+        return {'FINISHED'}
+
 class PickFolderAndSyncOperator(Operator):
     bl_idname = "cw_sollumz.pick_folder"
     bl_label = "Pick Folder or File and Sync"
@@ -123,114 +418,142 @@ class PickFolderAndSyncOperator(Operator):
         elif self.folder_prop == "rpf_path":
             props.rpf_path = picked_path
 
-        try:
-            payload = {
-                "GTAPath": props.gtapath,
-                "codewalkerOutputDir": props.codewalker_output_dir,
-                "blenderOutputDir": props.blender_output_dir,
-                "fivemOutputDir": props.fivem_output_dir,
-                "rpfArchivePath": props.rpf_path
-            }
-            response = requests.post(f"{get_api_base_url(props.api_port)}/set-config", json=payload)
-            if response.status_code == 200:
-                self.report({'INFO'}, "Path set and backend synced.")
-                if requires_restart:
-                    self.report({'WARNING'}, "GTA Path changed — please restart the backend.")
-            else:
-                self.report({'ERROR'}, f"Sync failed: {response.status_code}")
-        except Exception as e:
-            self.report({'ERROR'}, f"Error syncing config: {e}")
-
+        if is_backend_available(props):
+            # Several picks in a row end up as one /set-config with just the changed keys
+            schedule_push(context.scene)
+            self.report({'INFO'}, "Path set, syncing backend.")
+        else:
+            defer_operation(context, SyncBackendConfigOperator.bl_idname)
+            self.report({'WARNING'}, "Path set, backend unreachable; sync queued.")
+        if requires_restart:
+            self.report({'WARNING'}, "GTA Path changed — please restart the backend.")
         return {'FINISHED'}
     
-class ExportToRpfOperator(Operator):
+class ExportToRpfOperator(BackgroundJobMixin, Operator):
     bl_idname = "cw_sollumz.export_to_rpf"
     bl_label = "Export to RPF/FiveM"
 
+    # Main-thread time spent exporting per timer tick before yielding to the UI
+    TICK_BUDGET = 0.1
+
     def execute(self, context):
-        props = context.scene.cw_sollumz_props
-        exported_files = []
-
-        # === Force disable internal YTYP export ===
-        prefs = bpy.context.preferences.addons.get("bl_ext.user_default.sollumz")
-        if prefs:
-            export_settings = prefs.preferences.export_settings
-            if hasattr(export_settings, 'export_with_ytyp'):
-                export_settings.export_with_ytyp = False
-                print("[DEBUG] export_with_ytyp has been set to:", export_settings.export_with_ytyp)
-
-        selected_objects = context.selected_objects
-        selected_objects = promote_to_root_objects(selected_objects)
-
-        for obj in selected_objects:
-            try:
-                bpy.ops.object.select_all(action='DESELECT')
-                obj.select_set(True)
-                context.view_layer.objects.active = obj
-
-                # === Export model (YDR/YFT/etc) ===
-                result = bpy.ops.sollumz.export_assets(directory=props.blender_output_dir)
-                if result != {'FINISHED'}:
-                    self.report({'WARNING'}, f"Model export failed for {obj.name}")
-                    continue
-
-                # === Conditionally export YTYP ===
-                if props.export_with_ytyp:
-                    print(f"[DEBUG] Exporting YTYP for {obj.name}")
-                    try:
-                        # Try to find an existing YTYP by name (case-insensitive match)
-                        existing_ytyp = next((y for y in context.scene.ytyps if y.name.lower() == obj.name.lower()), None)
-
-                        if existing_ytyp:
-                            context.scene.ytyp_index = list(context.scene.ytyps).index(existing_ytyp)
-                            print(f"[DEBUG] Found existing YTYP: {existing_ytyp.name}")
-                        else:
-                            # Create a new YTYP and name it after the object
-                            bpy.ops.sollumz.createytyp()
-                            new_ytyp = context.scene.ytyps[-1]
-                            new_ytyp.name = obj.name.lower()
-                            context.scene.ytyp_index = len(context.scene.ytyps) - 1
-                            print(f"[DEBUG] Created new YTYP: {new_ytyp.name}")
-
-                        # Add archetype to selected object
-                        bpy.ops.sollumz.createarchetypefromselected()
-
-                        # Export just this YTYP (per object export)
-                        bpy.ops.sollumz.exportytyp(directory=props.blender_output_dir)
-
-                    except Exception as e:
-                        self.report({'WARNING'}, f"YTYP export failed for {obj.name}: {e}")
-
-                # === Collect any matching .xml files for this object ===
-                canonical_name = get_canonical_object_name(obj, context.scene.objects, profile=DEFAULT_EQUIVALENCE_PROFILE).lower()
-                for f in os.listdir(props.blender_output_dir):
-                    if f.lower().startswith(canonical_name + ".") and f.endswith(".xml"):
-                        full_path = os.path.join(props.blender_output_dir, f)
-                        exported_files.append(full_path)
-
-            except Exception as e:
-                self.report({'WARNING'}, f"Export failed for {obj.name}: {e}")
-
-        if not exported_files:
+        roots = promote_to_root_objects(context.selected_objects)
+        if not roots:
+            self.report({'ERROR'}, "No objects selected.")
+            return {'CANCELLED'}
+
+        deferred = defer_if_offline(self, context)
+        if deferred:
+            return deferred
+
+        self._run = ExportRun(context, roots, lambda level, message: self.report({level}, message))
+        return self.start_jobs(context, [self._run.uploader], f"Exporting {self._run.total} object(s)", interval=0.01)
+
+    def tick(self, context):
+        run = self._run
+        if not run.pending:
+            return
+        tick_started = time.monotonic()
+        while run.pending and time.monotonic() - tick_started < self.TICK_BUDGET:
+            run.export_next(context)
+        self._status = (
+            f"Exporting {run.total - run.pending}/{run.total}, "
+            f"pushed {run.uploader.uploaded_files} file(s)"
+        )
+
+    def on_cancel(self, context):
+        self._run.save_manifest()
+
+    def finish_jobs(self, context, jobs):
+        run = self._run
+        uploader = run.uploader
+        run.save_manifest()
+        for error in uploader.errors:
+            self.report({'WARNING'}, error)
+
+        if uploader.uploaded_files == 0:
+            if run.skipped and not run.exported:
+                self.report({'INFO'}, f"All {run.skipped} object(s) unchanged, nothing to export.")
+                return {'FINISHED'}
             self.report({'ERROR'}, "No valid XML files were exported.")
             return {'CANCELLED'}
 
-        # === Send collected files to backend ===
+        message = f"Imported {uploader.uploaded_files} file(s) to RPF and FiveM."
+        if run.skipped:
+            message += f" Skipped {run.skipped} unchanged object(s)."
+        if run.resumed:
+            message += f" Resumed after {run.resumed} object(s) exported earlier."
+        if run.shared:
+            message += f" {run.shared} duplicate(s) reused an equivalent object's asset."
+        self.report({'INFO'}, message)
+        return {'FINISHED'}
+
+
+class ResumeExportOperator(ExportToRpfOperator):
+    bl_idname = "cw_sollumz.resume_export"
+    bl_label = "Resume Export"
+
+    def execute(self, context):
+        props = context.scene.cw_sollumz_props
+        state = ExportJournal.load_unfinished(props.blender_output_dir)
+        if state is None:
+            self.report({'INFO'}, "No interrupted export to resume.")
+            return {'CANCELLED'}
+        if state["target"] != get_export_target(props):
+            self.report({'ERROR'}, "The interrupted export was for another RPF/FiveM target or YTYP setup.")
+            return {'CANCELLED'}
+
+        roots = [bpy.data.objects[name] for name in state["objects"] if name in bpy.data.objects]
+        missing = len(state["objects"]) - len(roots)
+        if missing:
+            self.report({'WARNING'}, f"{missing} object(s) of the interrupted export no longer exist.")
+        if not roots:
+            self.report({'ERROR'}, "None of the interrupted export's objects exist any more.")
+            return {'CANCELLED'}
+
+        deferred = defer_if_offline(self, context)
+        if deferred:
+            return deferred
+
+        self._run = ExportRun(context, roots, lambda level, message: self.report({level}, message), resume=state)
+        return self.start_jobs(context, [self._run.uploader], f"Resuming export of {self._run.pending} object(s)", interval=0.01)
+
+
+class ExportProfileOperator(Operator):
+    bl_idname = "cw_sollumz.export_profile"
+    bl_label = "Export Timings"
+
+    filepath: StringProperty(subtype="FILE_PATH")
+    trace_format: bpy.props.EnumProperty(
+        name="Format",
+        items=[
+            ('JSON', "JSON", "Raw spans plus a per-phase summary"),
+            ('CHROME', "Chrome Trace", "Trace-event format for chrome://tracing or Perfetto"),
+        ],
+        default='CHROME'
+    )
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "cw_sollumz_trace.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
         try:
-            response = requests.post(f"{get_api_base_url(props.api_port)}/import", data={
-                "xml": "true",
-                "filePaths": exported_files,
-                "rpfArchivePath": props.rpf_path,
-                "outputFolder": props.fivem_output_dir
-            })
-
-            if response.status_code == 200:
-                self.report({'INFO'}, f"Imported {len(exported_files)} file(s) to RPF and FiveM.")
-            else:
-                self.report({'ERROR'}, f"Import API failed: {response.status_code}")
-        except Exception as e:
-            self.report({'ERROR'}, f"Export error: {e}")
+            profiler.save(self.filepath, self.trace_format)
+        except OSError as e:
+            self.report({'ERROR'}, f"Could not write timings: {e}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Timings written to {self.filepath}")
+        return {'FINISHED'}
+
+class ClearProfileOperator(Operator):
+    bl_idname = "cw_sollumz.clear_profile"
+    bl_label = "Clear Timings"
 
+    def execute(self, context):
+        profiler.clear()
         return {'FINISHED'}
 
 
@@ -241,59 +564,95 @@ class ExportYtypOperator(Operator):
     def execute(self, context):
         props = context.scene.cw_sollumz_props
 
-        try:
-            bpy.ops.sollumz.createytyp()
+        selected_objects = promote_to_root_objects(context.selected_objects)
+        if not selected_objects:
+            self.report({'WARNING'}, "Please select at least one object.")
+            return {'CANCELLED'}
 
-            selected_objects = context.selected_objects
-            selected_objects = promote_to_root_objects(selected_objects)
+        mode = props.ytyp_mode
+        single_name = props.ytyp_name
+        if mode == 'PER_OBJECT':
+            # This operator has always written one YTYP for the whole selection,
+            # named after the object when only one is selected
+            mode = 'SINGLE'
             if len(selected_objects) == 1:
-                selected_name = selected_objects[0].name
-                ytyp_index = context.scene.ytyp_index
-                if 0 <= ytyp_index < len(context.scene.ytyps):
-                    context.scene.ytyps[ytyp_index].name = selected_name
-            else:
-                self.report({'WARNING'}, "Please select exactly one object to name the YTYP.")
-
-            bpy.ops.sollumz.createarchetypefromselected()
-            bpy.ops.sollumz.exportytyp(directory=props.blender_output_dir)
-            self.report({'INFO'}, "YTYP exported successfully.")
+                single_name = selected_objects[0].name
+
+        try:
+            ytyp_index = build_ytyp_index(context.scene)
+            groups = get_ytyp_groups(selected_objects, mode, single_name)
+            for name, objects in groups:
+                with span("ytyp export", count=len(objects)):
+                    export_ytyp_group(context, name, objects, props.blender_output_dir, ytyp_index)
+            self.report({'INFO'}, f"{len(groups)} YTYP(s) exported successfully.")
         except Exception as e:
             self.report({'ERROR'}, f"YTYP export failed: {e}")
             return {'CANCELLED'}
 
         return {'FINISHED'}
     
-class SyncBackendConfigOperator(Operator):
+class SyncBackendConfigOperator(BackgroundJobMixin, Operator):
     bl_idname = "cw_sollumz.sync_config"
     bl_label = "Sync Config to Backend"
 
+    force: BoolProperty(
+        name="Send All",
+        description="Send every setting, even those the backend is believed to have already",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
+
+    def invoke(self, context, event):
+        # Shift-click resends everything, e.g. after the backend was restarted
+        self.force = self.force or event.shift
+        return self.execute(context)
+
     def execute(self, context):
         props = context.scene.cw_sollumz_props
-        try:
-            payload = {
-                "GTAPath": props.gtapath,
-                "codewalkerOutputDir": props.codewalker_output_dir,
-                "blenderOutputDir": props.blender_output_dir,
-                "fivemOutputDir": props.fivem_output_dir,
-                "rpfArchivePath": props.rpf_path
-            }
-            response = requests.post(f"{get_api_base_url(props.api_port)}/set-config", json=payload)
-            if response.status_code == 200:
-                self.report({'INFO'}, "Backend configuration updated.")
-            else:
-                self.report({'ERROR'}, f"Failed to update backend config: {response.status_code}")
-        except Exception as e:
-            self.report({'ERROR'}, f"Failed to sync config: {str(e)}")
+        deferred = defer_if_offline(self, context, force=self.force)
+        if deferred:
+            return deferred
+        job = submit_push(props, force=self.force)
+        if job is None:
+            self.report({'INFO'}, "Backend configuration already up to date.")
+            return {'FINISHED'}
+        return self.start_job(context, job, "Syncing config")
+
+    def finish_job(self, context, job):
+        error = job.error_message()
+        if error:
+            self.report({'ERROR'}, f"Failed to update backend config: {error}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Backend configuration updated ({', '.join(job.result)}).")
+        return {'FINISHED'}
+
+class ClearQueuedOperationsOperator(Operator):
+    bl_idname = "cw_sollumz.clear_queued_operations"
+    bl_label = "Clear Queued Operations"
+
+    def execute(self, context):
+        clear_deferred_operations()
+        self.report({'INFO'}, "Queued operations cleared.")
         return {'FINISHED'}
 
 classes = [
     SearchFileOperator,
+    LoadMoreResultsOperator,
+    CancelSearchOperator,
+    RefreshSearchIndexOperator,
     ImportFileOperator,
+    SelectSearchResultsOperator,
+    BatchImportOperator,
+    ClearAssetCacheOperator,
     ExportToRpfOperator,
+    ResumeExportOperator,
     ExportYtypOperator,
     SyncBackendConfigOperator,
     PullBackendConfigOperator,
-    PickFolderAndSyncOperator
+    PickFolderAndSyncOperator,
+    ClearQueuedOperationsOperator,
+    ExportProfileOperator,
+    ClearProfileOperator
 ]
 
 def register():
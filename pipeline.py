@@ -0,0 +1,488 @@
+import bpy
+import collections
+import json
+import os
+import queue
+import threading
+import time
+
+from .cache import get_asset_cache, get_source_signature, get_texture_dir_name, get_xml_name
+from .client import get_client
+from .fingerprint import ExportManifest, compute_object_fingerprint
+from .health import backend_supports
+from .instancing import find_instance_source, instance_asset, register_asset, register_batch
+from .journal import ExportJournal
+from .library_cache import get_library_cache, get_new_objects, get_object_names, split_by_asset
+from .profiling import span
+from .texture_store import PushedTextures
+from .transport import collect_upload_files, submit_download, upload_stream
+from .utils import (
+    import_files,
+    find_exported_files,
+    index_exported_files,
+    get_ytyp_groups,
+    build_ytyp_index,
+    export_ytyp_group,
+    EquivalenceIndex,
+    DEFAULT_EQUIVALENCE_PROFILE,
+)
+
+
+class ExportUploader:
+    """Push exported XML to `/import` in batches on a background thread.
+
+    The export operator stages `(object name, canonical name)` pairs as soon as
+    Sollumz has written an object's files; the uploader resolves them to paths
+    with one directory scan per batch and posts them while the next objects
+    are still being exported on the main thread. `close()` flushes the last
+    batch, after which `done` becomes true.
+
+    With the STREAM transport the files themselves are posted instead of
+    their paths, so CodeWalker does not need to see the Blender output folder.
+    Given `pushed_textures`, textures the target already received are only
+    referenced by content hash. A failed batch is retried `retries` times with
+    exponential backoff; outcomes are written to `journal` when given.
+    """
+
+    RETRY_BACKOFF = 1.0
+    RETRY_BACKOFF_MAX = 30.0
+
+    def __init__(self, client, directory, since, payload, batch_size, transport='SHARED_FOLDER', pushed_textures=None,
+                 journal=None, retries=0):
+        self.client = client
+        self.directory = directory
+        self.since = since
+        self.payload = payload
+        self.batch_size = max(1, batch_size)
+        self.transport = transport
+        self.pushed_textures = pushed_textures
+        self.journal = journal
+        self.retries = retries
+        self.uploaded_names = []
+        self.uploaded_files = 0
+        self.errors = []
+        # Batches the API rejected or never answered; missing XML won't appear on a retry
+        self.failed_uploads = 0
+        self.cancelled = False
+        self._wake = threading.Event()
+        self._queue = queue.Queue()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="cw_sollumz_uploader", daemon=True)
+        self._thread.start()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def stage(self, name, canonical_name):
+        self._queue.put((name, canonical_name))
+
+    def close(self):
+        self._queue.put(None)
+
+    def cancel(self):
+        self.cancelled = True
+        self._wake.set()
+        self._queue.put(None)
+
+    def _run(self):
+        batch = []
+        closing = False
+        try:
+            while not closing and not self.cancelled:
+                item = self._queue.get()
+                if item is None:
+                    closing = True
+                else:
+                    batch.append(item)
+                if batch and (closing or len(batch) >= self.batch_size) and not self.cancelled:
+                    self._upload(batch)
+                    batch = []
+        finally:
+            self._done.set()
+
+    def _upload(self, batch):
+        index = None
+        files = []
+        names = []
+        for name, canonical_name in batch:
+            paths = find_exported_files(self.directory, canonical_name, since=self.since)
+            if not paths:
+                # Case-sensitive file systems keep the object's capitalisation; scan once per batch at most
+                if index is None:
+                    index = index_exported_files(self.directory, since=self.since)
+                paths = index.get(canonical_name)
+            if paths:
+                files.extend(paths)
+                names.append(name)
+            else:
+                self.errors.append(f"No XML found for {name}")
+        if not files:
+            return
+
+        error = None
+        hashes = {}
+        for attempt in range(self.retries + 1):
+            if attempt:
+                delay = min(self.RETRY_BACKOFF * 2 ** (attempt - 1), self.RETRY_BACKOFF_MAX)
+                if self._wake.wait(delay):
+                    break
+            try:
+                # Streamed bodies are generators, so every attempt builds a fresh one
+                with span("upload batch", count=len(names), files=len(files), attempt=attempt):
+                    if self.transport == 'STREAM':
+                        upload = collect_upload_files(files)
+                        fields = self.payload
+                        if self.pushed_textures is not None:
+                            upload, hashes, references = self.pushed_textures.split(upload)
+                            fields = dict(fields, textureHashes=json.dumps(hashes), textureRefs=json.dumps(references))
+                        response = upload_stream(self.client, fields, upload)
+                    else:
+                        response = self.client.request("POST", "/import", data=dict(self.payload, filePaths=files))
+                error = None if response.status_code == 200 else str(response.status_code)
+            except Exception as e:
+                error = str(e)
+            if error is None:
+                break
+
+        if error is not None:
+            self.errors.append(f"Import API failed for {len(files)} file(s): {error}")
+            self.failed_uploads += 1
+            if self.pushed_textures is not None:
+                self.pushed_textures.clear()
+            if self.journal is not None:
+                self.journal.record("upload_failed", names=names, error=error)
+            return
+        self.uploaded_names.extend(names)
+        self.uploaded_files += len(files)
+        if self.pushed_textures is not None:
+            self.pushed_textures.update(hashes.values())
+        if self.journal is not None:
+            self.journal.record("uploaded", durable=True, names=names)
+
+
+class ImportBatch:
+    """Cache lookup, chunked download and single Sollumz import for a set of RPF paths.
+
+    Used by the batch import operator and the headless driver. The caller
+    starts one job per chunk with `submit_downloads`, waits for them however it
+    likes and reports each chunk back through `complete_chunk`. With the
+    library cache, assets imported before are appended from their .blend and
+    the rest are written to it after the Sollumz import. With instancing,
+    assets already in the file are placed as linked duplicates instead.
+    """
+
+    def __init__(self, props, paths):
+        self.cache = get_asset_cache(props)
+        self.library = get_library_cache(props)
+        self.link = props.library_link
+        self.transport = props.transport_mode
+        self.paths = list(paths)
+        self.signatures = {}
+        self.imports = {}
+        self.library_hits = []
+        self.instances = []
+        # (RPF path or file name, message) pairs
+        self.errors = []
+
+        # === Split into instances, library hits, cache hits and downloads, grouped by target directory ===
+        downloads = {}
+        for path in paths:
+            if props.instance_imports and find_instance_source(path) is not None:
+                self.instances.append(path)
+                continue
+            signature = None
+            if self.cache is not None:
+                signature = get_source_signature(props.gtapath, path)
+                if self.library is not None and self.library.lookup(path, signature):
+                    self.signatures[path] = signature
+                    self.library_hits.append(path)
+                    continue
+                cached_name = self.cache.lookup(path, signature, save=False)
+                if cached_name:
+                    self.signatures[path] = signature
+                    self.imports.setdefault(self.cache.directory, []).append(cached_name)
+                    continue
+            if signature is not None:
+                self.signatures[path] = signature
+                downloads.setdefault(self.cache.ensure_directory(), []).append(path)
+            else:
+                downloads.setdefault(props.codewalker_output_dir, []).append(path)
+        if self.cache is not None:
+            self.cache.prepare_download(downloads.get(self.cache.directory, []))
+            self.cache.save()
+
+        chunk_size = props.batch_chunk_size
+        self.chunks = [
+            (directory, directory_paths[i:i + chunk_size])
+            for directory, directory_paths in downloads.items()
+            for i in range(0, len(directory_paths), chunk_size)
+        ]
+
+    @property
+    def download_count(self):
+        return sum(len(chunk) for _directory, chunk in self.chunks)
+
+    def submit_downloads(self, client):
+        """Start one download job per chunk, in the same order as `chunks`."""
+        return [
+            submit_download(client, self.transport, chunk, directory)
+            for directory, chunk in self.chunks
+        ]
+
+    def complete_chunk(self, directory, chunk, error):
+        for path in chunk:
+            file_name = get_xml_name(path)
+            if error:
+                self.errors.append((path, error))
+            elif not os.path.isfile(os.path.join(directory, file_name)):
+                self.errors.append((path, "no XML was written"))
+            else:
+                if path in self.signatures:
+                    self.cache.store(path, self.signatures[path], save=False)
+                self.imports.setdefault(directory, []).append(file_name)
+
+    def import_all(self):
+        """Run one Sollumz import per target directory (normally just one)."""
+        if self.cache is not None:
+            self.cache.save()
+        imported = 0
+        collection = bpy.context.collection
+        for path in self.instances:
+            if instance_asset(path, collection) is not None:
+                imported += 1
+            else:
+                self.errors.append((path, "instanced asset is no longer in the file"))
+
+        for path in self.library_hits:
+            objects = self.library.load(path, self.signatures[path], collection, link=self.link)
+            if objects is not None:
+                register_asset(path, objects)
+                imported += 1
+            else:
+                self.errors.append((path, "cached library could not be loaded"))
+
+        for directory, file_names in self.imports.items():
+            names_before = get_object_names()
+            if import_files(directory, file_names):
+                imported += len(file_names)
+                groups = split_by_asset(get_new_objects(names_before), file_names)
+                register_batch(self.paths, groups)
+                if self.library is not None and directory == self.cache.directory:
+                    self.store_library(directory, groups)
+            else:
+                self.errors.extend((name, "Sollumz import failed") for name in file_names)
+        return imported
+
+    def store_library(self, directory, groups):
+        paths = {get_xml_name(path).lower(): path for path in self.signatures}
+        for file_name, asset_objects in groups.items():
+            path = paths.get(file_name.lower())
+            if path is not None:
+                texture_dir = os.path.join(directory, get_texture_dir_name(file_name))
+                self.library.store(path, self.signatures[path], asset_objects, texture_dir)
+
+
+def disable_sollumz_ytyp_export():
+    prefs = bpy.context.preferences.addons.get("bl_ext.user_default.sollumz")
+    if prefs:
+        export_settings = prefs.preferences.export_settings
+        if hasattr(export_settings, 'export_with_ytyp'):
+            export_settings.export_with_ytyp = False
+            print("[DEBUG] export_with_ytyp has been set to:", export_settings.export_with_ytyp)
+
+
+def get_export_target(props):
+    """Key of the push destination and YTYP settings; manifests and journals are per target."""
+    return f"{props.rpf_path}|{props.fivem_output_dir}|{props.export_with_ytyp}|{props.ytyp_mode}"
+
+
+class ExportRun:
+    """State of one Export to RPF run, driven one object at a time on the main thread.
+
+    Used by ExportToRpfOperator from its modal timer and by the headless
+    driver in a plain loop. `report(level, message)` receives warnings and
+    errors with the operator's report levels ('INFO', 'WARNING', 'ERROR').
+    Progress is journaled; pass the state from `ExportJournal.load_unfinished`
+    as `resume` to continue an interrupted run.
+    """
+
+    def __init__(self, context, roots, report, resume=None):
+        props = context.scene.cw_sollumz_props
+        self.report = report
+        # Small margin for file systems with coarse mtime resolution
+        run_started = resume["since"] if resume else time.time() - 2.0
+
+        # === Force disable internal YTYP export ===
+        disable_sollumz_ytyp_export()
+
+        self.roots = list(roots)
+        self.queue = collections.deque(self.roots)
+        self.total = len(self.queue)
+        self.equivalence = EquivalenceIndex(context.scene.objects, profile=DEFAULT_EQUIVALENCE_PROFILE)
+
+        # === Skip objects whose content matches what was last pushed to this target ===
+        self.target = get_export_target(props)
+        self.manifest = ExportManifest(props.blender_output_dir)
+        self.fingerprints = {}
+        # canonical name -> object staged for it; staged object -> every object sharing its asset
+        self.staged = {}
+        self.members = {}
+        # Duplicates whose shared asset an interrupted run already pushed
+        self.pushed_members = []
+        self.skipped = 0
+        self.exported = 0
+        self.exported_objects = set()
+        self.exported_ytyps = set()
+        self.resumed = 0
+        self.ytyp_index = build_ytyp_index(context.scene) if props.export_with_ytyp else {}
+
+        self.journal = ExportJournal(props.blender_output_dir, run_id=resume["run"] if resume else None)
+        if resume is None:
+            self.journal.start(self.target, [obj.name for obj in self.roots], run_started, blend=bpy.data.filepath)
+
+        # === Uploads overlap with the exports that follow ===
+        self.uploader = ExportUploader(
+            get_client(props),
+            props.blender_output_dir,
+            run_started,
+            {
+                "xml": "true",
+                "rpfArchivePath": props.rpf_path,
+                "outputFolder": props.fivem_output_dir
+            },
+            props.upload_batch_size,
+            props.transport_mode,
+            # Only streamed uploads carry textures; shared-folder imports read them from disk
+            # and references by hash need a backend that resolves them
+            PushedTextures(props.blender_output_dir, f"{props.rpf_path}|{props.fivem_output_dir}", props.rpf_path)
+            if props.dedupe_textures and props.transport_mode == 'STREAM'
+            and backend_supports(props, "textureRefs") else None,
+            journal=self.journal,
+            retries=props.upload_retries,
+        )
+        if resume is not None:
+            self.resume(resume)
+        if not self.queue:
+            self.finish_exports(context)
+
+    def resume(self, state):
+        """Skip objects the interrupted run exported and re-stage what it never pushed."""
+        exported = state["exported"]
+        self.queue = collections.deque(obj for obj in self.roots if obj.name not in exported)
+        self.resumed = len(self.roots) - len(self.queue)
+        pushed = {exported[name]["canonical"] for name in state["uploaded"] if name in exported}
+        for name, entry in exported.items():
+            self.exported_objects.add(name)
+            if entry["fingerprint"] is not None:
+                self.fingerprints[name] = entry["fingerprint"]
+            if entry["canonical"] in pushed:
+                self.pushed_members.append(name)
+            else:
+                self.stage(name, entry["canonical"])
+        for group in state["ytyp"]:
+            self.exported_ytyps.add(group)
+            if f"YTYP {group}" not in state["uploaded"]:
+                self.uploader.stage(f"YTYP {group}", group)
+
+    @property
+    def pending(self):
+        return len(self.queue)
+
+    @property
+    def shared(self):
+        """Exported roots that were pushed through an equivalent root's asset."""
+        return sum(len(members) - 1 for members in self.members.values())
+
+    def export_next(self, context):
+        """Export the next queued object; flushes YTYPs and the uploader after the last one."""
+        if not self.queue:
+            return
+        self.export_object(context, self.queue.popleft())
+        if not self.queue:
+            self.finish_exports(context)
+
+    def finish_exports(self, context):
+        props = context.scene.cw_sollumz_props
+        if props.export_with_ytyp and props.ytyp_mode != 'PER_OBJECT':
+            self.export_ytyp_groups(context)
+        self.uploader.close()
+
+    def export_ytyp_groups(self, context):
+        """Batched YTYP mode: one YTYP per group, exported once after all models."""
+        props = context.scene.cw_sollumz_props
+        for name, objects in get_ytyp_groups(self.roots, props.ytyp_mode, props.ytyp_name):
+            # Groups without any re-exported object are already up to date
+            if name in self.exported_ytyps or not any(obj.name in self.exported_objects for obj in objects):
+                continue
+            try:
+                with span("ytyp export", count=len(objects)):
+                    export_ytyp_group(context, name, objects, props.blender_output_dir, self.ytyp_index)
+                self.journal.record("ytyp", group=name)
+                self.uploader.stage(f"YTYP {name}", name)
+            except Exception as e:
+                self.report('WARNING', f"YTYP export failed for {name}: {e}")
+
+    def export_object(self, context, obj):
+        props = context.scene.cw_sollumz_props
+        try:
+            if props.incremental_export:
+                with span("fingerprint", count=1):
+                    fingerprint = compute_object_fingerprint(obj)
+                if self.manifest.is_unchanged(obj.name, fingerprint, self.target):
+                    self.skipped += 1
+                    return
+                self.fingerprints[obj.name] = fingerprint
+
+            bpy.ops.object.select_all(action='DESELECT')
+            obj.select_set(True)
+            context.view_layer.objects.active = obj
+
+            # === Export model (YDR/YFT/etc) ===
+            with span("sollumz.export_assets", count=1):
+                result = bpy.ops.sollumz.export_assets(directory=props.blender_output_dir)
+            if result != {'FINISHED'}:
+                self.report('WARNING', f"Model export failed for {obj.name}")
+                return
+
+            # === Conditionally export YTYP (batched modes run after all models) ===
+            if props.export_with_ytyp and props.ytyp_mode == 'PER_OBJECT':
+                try:
+                    with span("ytyp export", count=1):
+                        export_ytyp_group(context, obj.name.lower(), [obj], props.blender_output_dir, self.ytyp_index)
+                except Exception as e:
+                    self.report('WARNING', f"YTYP export failed for {obj.name}: {e}")
+
+            # === Hand the written files to the uploader ===
+            self.exported += 1
+            self.exported_objects.add(obj.name)
+            canonical_name = self.equivalence.canonical_name(obj).lower()
+            self.journal.record("exported", object=obj.name, canonical=canonical_name, fingerprint=self.fingerprints.get(obj.name))
+            self.stage(obj.name, canonical_name)
+
+        except Exception as e:
+            self.report('WARNING', f"Export failed for {obj.name}: {e}")
+
+    def stage(self, name, canonical_name):
+        # Equivalent duplicates share one exported asset, which is uploaded once
+        staged_name = self.staged.get(canonical_name)
+        if staged_name is not None:
+            self.members[staged_name].append(name)
+            return
+        self.staged[canonical_name] = name
+        self.members[name] = [name]
+        self.uploader.stage(name, canonical_name)
+
+    def save_manifest(self):
+        # Objects only count as up to date once their push succeeded
+        names = [member for name in self.uploader.uploaded_names for member in self.members.get(name, [name])]
+        for name in names + self.pushed_members:
+            fingerprint = self.fingerprints.get(name)
+            if fingerprint is not None:
+                self.manifest.update(name, fingerprint, self.target)
+        self.manifest.save()
+        # Only a cancelled run or failed pushes leave work a resume could still do
+        if not self.queue and self.uploader.done and not self.uploader.cancelled and not self.uploader.failed_uploads:
+            self.journal.finish()
+        if self.uploader.pushed_textures is not None:
+            self.uploader.pushed_textures.save()
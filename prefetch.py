@@ -0,0 +1,140 @@
+import bpy
+import collections
+
+from .cache import get_asset_cache, get_source_signature
+from .client import get_client
+from .results import get_result_store
+from .transport import submit_download
+
+_prefetcher = None
+
+
+class Prefetcher:
+    """Download likely imports into the asset cache before they are clicked.
+
+    Paths are queued by the search (top results) and by the highlighted row;
+    at most `prefetch_concurrency` downloads run at once and prefetching stops
+    once `prefetch_budget_mb` have been cached for the current search. Finished downloads
+    are registered in the cache on the main thread, so Import only has to run
+    the Sollumz import.
+    """
+
+    def __init__(self, scene_name):
+        self.scene_name = scene_name
+        self.queue = collections.deque()
+        self.jobs = {}
+        self.signatures = {}
+        self.spent_bytes = 0
+
+    def props(self):
+        scene = bpy.data.scenes.get(self.scene_name)
+        return scene.cw_sollumz_props if scene is not None else None
+
+    def reset(self):
+        """Forget queued paths and the spent budget; running downloads still complete."""
+        self.queue.clear()
+        self.spent_bytes = 0
+        self.drop_cancelled()
+
+    def drop_cancelled(self):
+        # Cancelled jobs never get their callback, so their slot would stay taken
+        for path, job in list(self.jobs.items()):
+            if job.cancelled:
+                del self.jobs[path]
+                self.signatures.pop(path, None)
+
+    def request(self, paths, urgent=False):
+        for path in paths:
+            if path in self.jobs or path in self.queue:
+                if urgent and path in self.queue:
+                    self.queue.remove(path)
+                    self.queue.appendleft(path)
+                continue
+            if urgent:
+                self.queue.appendleft(path)
+            else:
+                self.queue.append(path)
+        self.pump()
+
+    def job_for(self, path):
+        """The running prefetch of `path`, so an import can wait for it instead of downloading again."""
+        job = self.jobs.get(path)
+        return job if job is not None and not job.cancelled else None
+
+    def pump(self):
+        self.drop_cancelled()
+        props = self.props()
+        if props is None:
+            self.queue.clear()
+            return
+        cache = get_asset_cache(props)
+        if cache is None or not props.use_prefetch:
+            self.queue.clear()
+            return
+
+        while self.queue and len(self.jobs) < props.prefetch_concurrency:
+            if self.spent_bytes >= props.prefetch_budget_mb * 1024 * 1024:
+                self.queue.clear()
+                return
+            path = self.queue.popleft()
+            signature = get_source_signature(props.gtapath, path)
+            # Unverifiable sources are never cached, and hits need no download
+            if signature is None or cache.lookup(path, signature, save=False):
+                continue
+            self.signatures[path] = signature
+            cache.prepare_download([path])
+            self.jobs[path] = submit_download(
+                get_client(props), props.transport_mode, [path], cache.ensure_directory(),
+                callback=lambda job, path=path: self._finished(path, job),
+            )
+
+    def _finished(self, path, job):
+        self.jobs.pop(path, None)
+        signature = self.signatures.pop(path, None)
+        props = self.props()
+        cache = get_asset_cache(props) if props is not None else None
+        error = job.error_message()
+        if error:
+            print(f"[ERROR] Prefetch of {path} failed: {error}")
+        elif cache is not None and cache.store(path, signature):
+            self.spent_bytes += cache.entries[cache.entry_key(path)]["bytes"]
+        self.pump()
+
+
+def get_prefetcher(scene):
+    global _prefetcher
+    if _prefetcher is None or _prefetcher.scene_name != scene.name:
+        _prefetcher = Prefetcher(scene.name)
+    return _prefetcher
+
+
+def get_prefetch_job(scene, path):
+    if _prefetcher is None or _prefetcher.scene_name != scene.name:
+        return None
+    return _prefetcher.job_for(path)
+
+
+def prefetch_top_results(scene):
+    """Queue the first `prefetch_count` search results of a fresh search."""
+    props = scene.cw_sollumz_props
+    if not props.use_prefetch or not props.use_asset_cache:
+        return
+    prefetcher = get_prefetcher(scene)
+    prefetcher.reset()
+    prefetcher.request(get_result_store().paths[:props.prefetch_count])
+
+
+def prefetch_active_result(scene):
+    props = scene.cw_sollumz_props
+    index = bpy.context.window_manager.cw_sollumz_active_index
+    store = get_result_store()
+    if not props.use_prefetch or not props.use_asset_cache or not 0 <= index < len(store):
+        return
+    get_prefetcher(scene).request([store[index]], urgent=True)
+
+
+def unregister():
+    global _prefetcher
+    if _prefetcher is not None:
+        _prefetcher.reset()
+    _prefetcher = None
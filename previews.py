@@ -0,0 +1,379 @@
+import bpy
+import bpy.utils.previews
+import collections
+import hashlib
+import math
+import os
+import queue
+import struct
+import threading
+import xml.etree.ElementTree as ET
+import zlib
+
+from .cache import get_asset_cache, get_source_signature
+from .client import get_client
+from .health import is_backend_available
+from .transport import submit_download
+from .utils import redraw_view3d
+
+PREVIEW_DIR_NAME = ".cw_previews"
+PREVIEW_SIZE = 128
+# Larger meshes are sampled down to this many triangles
+MAX_TRIANGLES = 20000
+# Thumbnails kept loaded as icons
+MAX_LOADED = 200
+MAX_DOWNLOADS = 2
+# Rows scrolled past are dropped once this many are waiting
+MAX_WAITING = 32
+POLL_INTERVAL = 0.2
+# Three-quarter view from the front right, GTA is Z up
+VIEW_AZIMUTH = math.radians(35.0)
+VIEW_ELEVATION = math.radians(25.0)
+
+_manager = None
+
+
+# === Silhouette rendering ===
+
+def read_high_lod_triangles(xml_path):
+    """Return `(vertices, triangles)` of every high LOD geometry in a CodeWalker XML."""
+    vertices = []
+    triangles = []
+    in_high = 0
+    offset = 0
+    for event, elem in ET.iterparse(xml_path, events=("start", "end")):
+        if event == "start":
+            if elem.tag == "DrawableModelsHigh":
+                in_high += 1
+            continue
+        if elem.tag == "DrawableModelsHigh":
+            in_high -= 1
+        elif elem.tag == "VertexBuffer":
+            data = elem.find("Data")
+            if data is None:
+                data = elem.find("Data2")
+            if in_high and data is not None and data.text:
+                offset = len(vertices)
+                for line in data.text.strip().splitlines():
+                    values = line.split()
+                    vertices.append((float(values[0]), float(values[1]), float(values[2])))
+            elem.clear()
+        elif elem.tag == "IndexBuffer":
+            data = elem.find("Data")
+            if in_high and data is not None and data.text:
+                indices = [int(value) + offset for value in data.text.split()]
+                triangles.extend(zip(indices[0::3], indices[1::3], indices[2::3]))
+            elem.clear()
+    return vertices, triangles
+
+
+def render_silhouette(vertices, triangles, size=PREVIEW_SIZE):
+    """Flat-shaded three-quarter view as top-down RGBA rows, or None without geometry."""
+    if len(triangles) > MAX_TRIANGLES:
+        triangles = triangles[::len(triangles) // MAX_TRIANGLES + 1]
+    if not triangles:
+        return None
+
+    cos_a, sin_a = math.cos(VIEW_AZIMUTH), math.sin(VIEW_AZIMUTH)
+    cos_e, sin_e = math.cos(VIEW_ELEVATION), math.sin(VIEW_ELEVATION)
+    projected = []
+    for x, y, z in vertices:
+        u = x * cos_a - y * sin_a
+        forward = x * sin_a + y * cos_a
+        projected.append((u, z * cos_e - forward * sin_e, -(forward * cos_e + z * sin_e)))
+
+    used = {index for triangle in triangles for index in triangle if index < len(projected)}
+    if not used:
+        return None
+    min_u = min(projected[i][0] for i in used)
+    max_u = max(projected[i][0] for i in used)
+    min_v = min(projected[i][1] for i in used)
+    max_v = max(projected[i][1] for i in used)
+    extent = max(max_u - min_u, max_v - min_v) or 1.0
+    scale = (size - 8) / extent
+    center_u = (min_u + max_u) / 2
+    center_v = (min_v + max_v) / 2
+    screen = [
+        ((u - center_u) * scale + size / 2, size / 2 - (v - center_v) * scale, depth)
+        for u, v, depth in projected
+    ]
+
+    pixels = bytearray(size * size * 4)
+    depths = [math.inf] * (size * size)
+    for i0, i1, i2 in triangles:
+        if max(i0, i1, i2) >= len(screen):
+            continue
+        (x0, y0, d0), (x1, y1, d1), (x2, y2, d2) = screen[i0], screen[i1], screen[i2]
+        area = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+        if abs(area) < 1e-9:
+            continue
+        # Lighting from the view-space normal, both faces lit since winding varies
+        (px0, py0, pz0), (px1, py1, pz1), (px2, py2, pz2) = projected[i0], projected[i1], projected[i2]
+        nx = (py1 - py0) * (pz2 - pz0) - (pz1 - pz0) * (py2 - py0)
+        ny = (pz1 - pz0) * (px2 - px0) - (px1 - px0) * (pz2 - pz0)
+        nz = (px1 - px0) * (py2 - py0) - (py1 - py0) * (px2 - px0)
+        length = math.sqrt(nx * nx + ny * ny + nz * nz) or 1.0
+        shade = 0.35 + 0.65 * abs(nz) / length
+        color = bytes((int(190 * shade), int(200 * shade), int(215 * shade), 255))
+
+        left = max(int(min(x0, x1, x2)), 0)
+        right = min(int(max(x0, x1, x2)) + 1, size)
+        top = max(int(min(y0, y1, y2)), 0)
+        bottom = min(int(max(y0, y1, y2)) + 1, size)
+        for py in range(top, bottom):
+            cy = py + 0.5
+            for px in range(left, right):
+                cx = px + 0.5
+                w0 = ((x1 - cx) * (y2 - cy) - (x2 - cx) * (y1 - cy)) / area
+                w1 = ((x2 - cx) * (y0 - cy) - (x0 - cx) * (y2 - cy)) / area
+                w2 = 1.0 - w0 - w1
+                if w0 < 0 or w1 < 0 or w2 < 0:
+                    continue
+                depth = w0 * d0 + w1 * d1 + w2 * d2
+                index = py * size + px
+                if depth < depths[index]:
+                    depths[index] = depth
+                    pixels[index * 4:index * 4 + 4] = color
+    return [bytes(pixels[row * size * 4:(row + 1) * size * 4]) for row in range(size)]
+
+
+def write_png(path, rows):
+    size = len(rows)
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    raw = b"".join(b"\x00" + row for row in rows)
+    png = (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 6, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw, 6))
+        + chunk(b"IEND", b"")
+    )
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(png)
+    os.replace(tmp_path, path)
+
+
+# === Preview manager ===
+
+class PreviewManager:
+    """Thumbnails of search results, generated only for rows that are drawn.
+
+    A row without a thumbnail is rendered from its cached XML on a background
+    thread, after downloading the XML into the asset cache if needed.
+    Thumbnails are PNGs in the asset cache keyed by RPF path and source
+    archive signature, trimmed to `preview_cache_size` least recently used
+    files. At most MAX_LOADED of them are kept loaded as icons.
+    """
+
+    def __init__(self, scene_name, cache):
+        self.scene_name = scene_name
+        self.cache = cache
+        self.directory = os.path.join(cache.directory, PREVIEW_DIR_NAME)
+        self.collection = bpy.utils.previews.new()
+        # path -> key while loaded, or 'WAITING', 'DOWNLOADING', 'RENDERING', 'NONE'
+        self.states = {}
+        self.loaded = collections.OrderedDict()
+        self.waiting = collections.deque()
+        self.downloads = 0
+        self.rendering = 0
+        self.max_files = 2000
+        self.written = 0
+        self._render_queue = queue.Queue()
+        self._rendered = collections.deque()
+        self._thread = threading.Thread(target=self._run, name="cw_sollumz_previews", daemon=True)
+        self._thread.start()
+
+    def props(self):
+        scene = bpy.data.scenes.get(self.scene_name)
+        return scene.cw_sollumz_props if scene is not None else None
+
+    def png_path(self, path, signature):
+        key = f"{self.cache.entry_key(path)}|{signature[0]}|{signature[1]}"
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(self.directory, digest + ".png")
+
+    def icon(self, path):
+        """Icon id for `path`, or 0 while the thumbnail is not ready (and then request it)."""
+        state = self.states.get(path)
+        if state in self.loaded:
+            self.loaded.move_to_end(state)
+            return self.collection[state].icon_id
+        if state is None:
+            self.request(path)
+        return 0
+
+    def request(self, path):
+        props = self.props()
+        signature = get_source_signature(props.gtapath, path) if props is not None else None
+        if signature is None:
+            self.states[path] = 'NONE'
+            return
+        png_path = self.png_path(path, signature)
+        if os.path.isfile(png_path):
+            self.load(path, png_path)
+            return
+        cached_name = self.cache.lookup(path, signature, save=False)
+        if cached_name:
+            self.states[path] = 'RENDERING'
+            self.rendering += 1
+            self._render_queue.put((path, os.path.join(self.cache.directory, cached_name), png_path))
+            _ensure_poll()
+            return
+        # Most recently drawn rows first, rows scrolled past are dropped
+        self.states[path] = 'WAITING'
+        self.waiting.appendleft((path, signature))
+        while len(self.waiting) > MAX_WAITING:
+            dropped, _signature = self.waiting.pop()
+            self.states.pop(dropped, None)
+        self.pump()
+        _ensure_poll()
+
+    def pump(self):
+        props = self.props()
+        if props is None or not is_backend_available(props):
+            return
+        while self.waiting and self.downloads < MAX_DOWNLOADS:
+            path, signature = self.waiting.popleft()
+            self.states[path] = 'DOWNLOADING'
+            self.downloads += 1
+            self.cache.prepare_download([path])
+            submit_download(
+                get_client(props), props.transport_mode, [path], self.cache.ensure_directory(),
+                callback=lambda job, path=path, signature=signature: self._downloaded(path, signature, job),
+            )
+
+    def _downloaded(self, path, signature, job):
+        self.downloads -= 1
+        error = job.error_message()
+        if error or not self.cache.store(path, signature):
+            # No thumbnail is shown; an import reports the download error itself
+            self.states[path] = 'NONE'
+        else:
+            self.states.pop(path, None)
+            self.request(path)
+        self.pump()
+
+    def load(self, path, png_path):
+        key = os.path.basename(png_path)
+        if key not in self.collection:
+            self.collection.load(key, png_path, 'IMAGE')
+        self.states[path] = key
+        self.loaded[key] = path
+        self.loaded.move_to_end(key)
+        try:
+            os.utime(png_path)
+        except OSError:
+            pass
+        while len(self.loaded) > MAX_LOADED:
+            old_key, old_path = self.loaded.popitem(last=False)
+            del self.collection[old_key]
+            self.states.pop(old_path, None)
+
+    def _run(self):
+        while True:
+            item = self._render_queue.get()
+            if item is None:
+                return
+            path, xml_path, png_path = item
+            try:
+                rows = render_silhouette(*read_high_lod_triangles(xml_path))
+                if rows is not None:
+                    os.makedirs(self.directory, exist_ok=True)
+                    write_png(png_path, rows)
+            except Exception:
+                # Unreadable or unsupported XML just gets no thumbnail
+                rows = None
+            self._rendered.append((path, png_path if rows is not None else None))
+
+    def poll(self):
+        """Main-thread side: load rendered thumbnails; returns whether anything changed."""
+        changed = False
+        while self._rendered:
+            path, png_path = self._rendered.popleft()
+            self.rendering -= 1
+            if png_path is None:
+                self.states[path] = 'NONE'
+                continue
+            self.load(path, png_path)
+            self.written += 1
+            changed = True
+        if self.written >= 50:
+            self.written = 0
+            self.prune()
+        return changed
+
+    @property
+    def busy(self):
+        return bool(self.waiting) or self.downloads > 0 or self.rendering > 0
+
+    def prune(self):
+        """Delete the least recently used thumbnails beyond `max_files`."""
+        try:
+            entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".png")]
+        except OSError:
+            return
+        if len(entries) <= self.max_files:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_files]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def close(self):
+        self._render_queue.put(None)
+        bpy.utils.previews.remove(self.collection)
+
+
+def get_preview_manager(scene):
+    """Return the manager for `scene`, or None unless previews and the asset cache are enabled."""
+    global _manager
+    props = scene.cw_sollumz_props
+    cache = get_asset_cache(props) if props.use_previews else None
+    if cache is None:
+        return None
+    if _manager is None or _manager.scene_name != scene.name or _manager.cache is not cache:
+        if _manager is not None:
+            _manager.close()
+        _manager = PreviewManager(scene.name, cache)
+    _manager.max_files = props.preview_cache_size
+    return _manager
+
+
+def get_preview_icon(scene, path):
+    manager = get_preview_manager(scene)
+    return manager.icon(path) if manager is not None else 0
+
+
+def _ensure_poll():
+    if not bpy.app.timers.is_registered(_poll):
+        bpy.app.timers.register(_poll, first_interval=POLL_INTERVAL)
+
+
+def _poll():
+    manager = _manager
+    if manager is None:
+        return None
+    # Rows that waited for an unreachable backend
+    manager.pump()
+    if manager.poll():
+        redraw_view3d()
+    return POLL_INTERVAL if manager.busy else None
+
+
+def reset_previews():
+    """Drop loaded thumbnails, e.g. after their files were deleted with the asset cache."""
+    global _manager
+    if _manager is not None:
+        _manager.close()
+    _manager = None
+
+
+def unregister():
+    if bpy.app.timers.is_registered(_poll):
+        bpy.app.timers.unregister(_poll)
+    reset_previews()
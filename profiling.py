@@ -0,0 +1,96 @@
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+
+RING_SIZE = 4096
+
+
+class Profiler:
+    """Thread-safe ring buffer of timed spans.
+
+    Every span stores a monotonic start/duration in nanoseconds, the thread it
+    ran on and free-form metrics such as `bytes` or `count`.
+    """
+
+    def __init__(self, capacity=RING_SIZE):
+        self.records = collections.deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._origin = time.monotonic_ns()
+
+    @contextlib.contextmanager
+    def span(self, name, **metrics):
+        """Time the `with` block; the yielded dict can be filled with metrics."""
+        start = time.monotonic_ns()
+        try:
+            yield metrics
+        finally:
+            self.record(name, start, time.monotonic_ns(), **metrics)
+
+    def record(self, name, start_ns, end_ns, **metrics):
+        with self._lock:
+            self.records.append({
+                "name": name,
+                "start": start_ns - self._origin,
+                "duration": end_ns - start_ns,
+                "thread": threading.current_thread().name,
+                "metrics": metrics,
+            })
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.records)
+
+    def clear(self):
+        with self._lock:
+            self.records.clear()
+
+    def summary(self):
+        """Aggregate spans by name, slowest total first."""
+        totals = {}
+        for record in self.snapshot():
+            entry = totals.setdefault(record["name"], {"name": record["name"], "count": 0, "total_ms": 0.0, "max_ms": 0.0, "bytes": 0, "objects": 0})
+            ms = record["duration"] / 1e6
+            entry["count"] += 1
+            entry["total_ms"] += ms
+            entry["max_ms"] = max(entry["max_ms"], ms)
+            entry["bytes"] += record["metrics"].get("bytes", 0)
+            entry["objects"] += record["metrics"].get("count", 0)
+        return sorted(totals.values(), key=lambda e: e["total_ms"], reverse=True)
+
+    def to_json(self):
+        return {"spans": self.snapshot(), "summary": self.summary()}
+
+    def to_chrome_trace(self):
+        """Return the spans in Chrome trace-event format (chrome://tracing, Perfetto)."""
+        thread_ids = {}
+        events = []
+        for record in self.snapshot():
+            tid = thread_ids.setdefault(record["thread"], len(thread_ids) + 1)
+            events.append({
+                "name": record["name"],
+                "cat": "cw_sollumz",
+                "ph": "X",
+                "ts": record["start"] / 1000.0,
+                "dur": record["duration"] / 1000.0,
+                "pid": os.getpid(),
+                "tid": tid,
+                "args": record["metrics"],
+            })
+        for thread, tid in thread_ids.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": thread}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save(self, filepath, trace_format='JSON'):
+        data = self.to_chrome_trace() if trace_format == 'CHROME' else self.to_json()
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+
+
+profiler = Profiler()
+
+
+def span(name, **metrics):
+    return profiler.span(name, **metrics)
@@ -4,9 +4,15 @@ from bpy.props import (
     CollectionProperty,
     PointerProperty,
     IntProperty,
-    BoolProperty
+    FloatProperty,
+    BoolProperty,
+    EnumProperty
 )
 from bpy.types import PropertyGroup
+from .search import get_search_session, cancel_search, run_local_search
+from .search_index import get_local_index
+from .prefetch import prefetch_active_result
+from .results import is_resetting_index
 
 DEFAULT_PORT = "5555"
 DEFAULT_GTAPATH = "C:\\Program Files\\Rockstar Games\\Grand Theft Auto V"
@@ -14,18 +20,73 @@ DEFAULT_CODEWALKER_OUTPUT_DIR = "C:\\GTA_FILES\cw_out"
 DEFAULT_BLENDER_OUTPUT_DIR = "C:\\GTA_FILES\\blender_out"
 DEFAULT_FIVEM_DIR = "C:\\GTA_FILES\\fivem_out"
 
+def _on_search_filename_update(self, context):
+    # A new query makes any in-flight search for the old one pointless
+    session = get_search_session()
+    if session is not None and session.running and session.query != self.search_filename:
+        cancel_search()
+    # As-you-type results when the local index is available; only the prefix
+    # lookup is cheap enough per keystroke, Search adds substring and fuzzy matches
+    index = get_local_index(self)
+    if index is not None and index.loaded and self.search_filename.strip():
+        run_local_search(context.scene, index, prefix_only=True)
+
+def _on_active_index_update(self, context):
+    # The highlighted row is the most likely next import, once the user picked it
+    if not is_resetting_index():
+        prefetch_active_result(context.scene)
+
 class SearchResultItem(PropertyGroup):
-    name: StringProperty(name="Result Name")
+    # The path itself lives in results.ResultStore; a row only carries its selection
+    selected: BoolProperty(name="Selected", description="Include in batch import", default=False)
 
 class CW_Sollumz_Properties(PropertyGroup):
     show_api_section: BoolProperty(name="Show API Config", default=False)
     show_export_section: BoolProperty(name="Show Export", default=False)
     show_search_section: BoolProperty(name="Show Search", default=True)
+    show_performance_section: BoolProperty(name="Show Performance", default=False)
     api_port: StringProperty(
         name="API Port",
         description="Port of the running CodeWalker API",
         default=DEFAULT_PORT
     )
+    request_timeout: FloatProperty(
+        name="Request Timeout",
+        description="Seconds to wait for a CodeWalker API response before giving up",
+        default=30.0,
+        min=1.0,
+        soft_max=300.0
+    )
+    request_retries: IntProperty(
+        name="Retries",
+        description="How often a failed connection or 502/503/504 response is retried",
+        default=2,
+        min=0,
+        max=10
+    )
+    connection_pool_size: IntProperty(
+        name="Connections",
+        description="Number of keep-alive connections and background request workers",
+        default=4,
+        min=1,
+        max=16
+    )
+    health_check_interval: FloatProperty(
+        name="Health Check",
+        description="Seconds between background checks that CodeWalker.API is reachable",
+        default=2.0,
+        min=0.5,
+        soft_max=30.0
+    )
+    transport_mode: EnumProperty(
+        name="Transport",
+        description="How XML moves between Blender and CodeWalker",
+        items=[
+            ('SHARED_FOLDER', "Shared Folder", "CodeWalker reads and writes the output directories directly; both must see the same paths"),
+            ('STREAM', "Stream", "Send and receive XML in gzip-compressed request and response bodies; CodeWalker can run on another machine"),
+        ],
+        default='SHARED_FOLDER'
+    )
     gtapath: StringProperty(
         name="GTA V Path",
         description="Path to the GTA V installation",
@@ -34,7 +95,63 @@ class CW_Sollumz_Properties(PropertyGroup):
     search_filename: StringProperty(
         name="Filename",
         description="Enter filename to search",
-        default=""
+        default="",
+        options={'TEXTEDIT_UPDATE'},
+        update=_on_search_filename_update
+    )
+    use_local_index: BoolProperty(
+        name="Local Index",
+        description="Search a local index of RPF entry paths, by prefix as you type and also by substring and fuzzy match on Search; the server is only used to rebuild it when the GTA install changes",
+        default=False
+    )
+    search_page_size: IntProperty(
+        name="Page Size",
+        description="Number of search results requested per page",
+        default=250,
+        min=10,
+        max=5000
+    )
+    search_result_limit: IntProperty(
+        name="Result Limit",
+        description="Maximum number of search results kept in the list",
+        default=2000,
+        min=10
+    )
+    use_prefetch: BoolProperty(
+        name="Prefetch",
+        description="Download the top search results and the highlighted one into the cache in the background, so Import only runs the Sollumz import",
+        default=False
+    )
+    prefetch_count: IntProperty(
+        name="Top",
+        description="Number of top search results to prefetch",
+        default=3,
+        min=0,
+        max=50
+    )
+    prefetch_concurrency: IntProperty(
+        name="Parallel",
+        description="Prefetch downloads running at the same time",
+        default=2,
+        min=1,
+        max=8
+    )
+    prefetch_budget_mb: IntProperty(
+        name="Budget (MB)",
+        description="Stop prefetching for the current search once this much has been cached",
+        default=64,
+        min=1
+    )
+    use_previews: BoolProperty(
+        name="Previews",
+        description="Show mesh thumbnails for visible search results, rendered in the background from the cached XML (downloading it if needed)",
+        default=False
+    )
+    preview_cache_size: IntProperty(
+        name="Preview Cache Size",
+        description="Thumbnails kept on disk; the least recently shown ones are deleted first",
+        default=2000,
+        min=50
     )
     codewalker_output_dir: StringProperty(
         name="CodeWalker Output Directory",
@@ -56,12 +173,83 @@ class CW_Sollumz_Properties(PropertyGroup):
         description="Path to the target RPF archive",
         default="C:\\Program Files\\Rockstar Games\\Grand Theft Auto V\\modstore\\new.rpf"
     )
+    incremental_export: BoolProperty(
+        name="Skip Unchanged Objects",
+        description="Only export and push objects whose mesh, materials, transforms or custom properties changed since the last successful push",
+        default=True
+    )
+    upload_batch_size: IntProperty(
+        name="Upload Batch Size",
+        description="Exported objects pushed to the RPF per /import request while the export continues",
+        default=10,
+        min=1,
+        max=500
+    )
+    upload_retries: IntProperty(
+        name="Upload Retries",
+        description="Times a failed /import batch is retried, waiting longer after each attempt",
+        default=3,
+        min=0,
+        max=10
+    )
     export_with_ytyp: BoolProperty(
         name="With YTYP (autogenerated)",
         description="Enable to auto-generate and export YTYP",
         default=False
     )
-    search_results: CollectionProperty(type=SearchResultItem)
+    use_asset_cache: BoolProperty(
+        name="Cache Downloads",
+        description="Keep downloaded XML in a local cache and skip the API when the source archive is unchanged",
+        default=True
+    )
+    dedupe_textures: BoolProperty(
+        name="Deduplicate Textures",
+        description="Keep one copy of identical cached textures (hard links) and, with the Stream transport and a backend that accepts texture references, send each texture to a target only once",
+        default=True
+    )
+    instance_imports: BoolProperty(
+        name="Instance Repeated Imports",
+        description="Import an asset that is already in the file as a linked duplicate sharing its meshes, materials and images instead of parsing it again",
+        default=False
+    )
+    use_library_cache: BoolProperty(
+        name="Library Cache (.blend)",
+        description="Save every imported asset to a .blend in the asset cache and append it from there next time instead of parsing the XML again",
+        default=False
+    )
+    library_link: BoolProperty(
+        name="Link From Library",
+        description="Link cached assets instead of appending them; linked data is read-only but shared between imports",
+        default=False
+    )
+    cache_size_mb: IntProperty(
+        name="Cache Size (MB)",
+        description="Least recently used assets are evicted once the cache grows past this size",
+        default=2048,
+        min=64
+    )
+    batch_chunk_size: IntProperty(
+        name="Batch Chunk Size",
+        description="Number of files requested per /download-files call during batch import",
+        default=25,
+        min=1,
+        max=500
+    )
+    ytyp_mode: EnumProperty(
+        name="YTYP Mode",
+        description="How selected objects are grouped into YTYP files",
+        items=[
+            ('PER_OBJECT', "Per Object", "One YTYP per exported object"),
+            ('SINGLE', "Single", "One YTYP with an archetype for every exported object"),
+            ('PER_COLLECTION', "Per Collection", "One YTYP per collection of the exported objects"),
+        ],
+        default='PER_OBJECT'
+    )
+    ytyp_name: StringProperty(
+        name="YTYP Name",
+        description="Name of the YTYP in Single mode; defaults to the .blend file name",
+        default=""
+    )
 
 classes = [SearchResultItem, CW_Sollumz_Properties]
 
@@ -70,10 +258,13 @@ def register():
         bpy.utils.register_class(cls)
     # ✅ Register properties only after class is registered
     bpy.types.Scene.cw_sollumz_props = PointerProperty(type=CW_Sollumz_Properties)
-    bpy.types.Scene.cw_sollumz_active_index = IntProperty()
+    # Results live on the window manager: not saved into the .blend and not part of undo
+    bpy.types.WindowManager.cw_sollumz_results = CollectionProperty(type=SearchResultItem)
+    bpy.types.WindowManager.cw_sollumz_active_index = IntProperty(update=_on_active_index_update)
 
 def unregister():
     del bpy.types.Scene.cw_sollumz_props
-    del bpy.types.Scene.cw_sollumz_active_index
+    del bpy.types.WindowManager.cw_sollumz_results
+    del bpy.types.WindowManager.cw_sollumz_active_index
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
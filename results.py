@@ -0,0 +1,132 @@
+import fnmatch
+import sys
+
+_store = None
+# True while set_results moves the highlight, which is not the user picking a row
+_resetting_index = False
+
+
+class ResultStore:
+    """Search results kept in Python instead of RNA.
+
+    Paths are interned and split once into file name and folder, so drawing
+    and filtering the list never parse strings again. The UI list is backed
+    by `WindowManager.cw_sollumz_results`, which only holds the per-row
+    selection flag; window manager data is neither saved into the .blend nor
+    part of undo steps.
+    """
+
+    def __init__(self):
+        self.paths = []
+        self.names = []
+        self.folders = []
+        self.keys = []
+        # Bumped on every change so cached filter results can be reused
+        self.version = 0
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __getitem__(self, index):
+        return self.paths[index]
+
+    def clear(self):
+        self.paths.clear()
+        self.names.clear()
+        self.folders.clear()
+        self.keys.clear()
+        self.version += 1
+
+    def extend(self, paths):
+        for path in paths:
+            path = sys.intern(path)
+            folder, _sep, name = path.replace("/", "\\").rpartition("\\")
+            self.paths.append(path)
+            self.names.append(sys.intern(name))
+            self.folders.append(sys.intern(folder))
+            self.keys.append(name.lower())
+        self.version += 1
+
+
+def get_result_store():
+    global _store
+    if _store is None:
+        _store = ResultStore()
+    return _store
+
+
+def set_results(wm, paths):
+    """Replace all results, reusing existing rows so as-you-type searches stay cheap."""
+    global _resetting_index
+    store = get_result_store()
+    store.clear()
+    store.extend(paths)
+    items = wm.cw_sollumz_results
+    while len(items) > len(store):
+        items.remove(len(items) - 1)
+    for _ in range(len(store) - len(items)):
+        items.add()
+    items.foreach_set("selected", [False] * len(items))
+    _resetting_index = True
+    try:
+        wm.cw_sollumz_active_index = 0
+    finally:
+        _resetting_index = False
+
+
+def is_resetting_index():
+    return _resetting_index
+
+
+def clear_results(wm):
+    set_results(wm, ())
+
+
+def append_results(wm, paths):
+    store = get_result_store()
+    store.extend(paths)
+    items = wm.cw_sollumz_results
+    for _ in range(len(store) - len(items)):
+        items.add()
+
+
+def get_selected_paths(wm):
+    store = get_result_store()
+    return [store.paths[i] for i, item in enumerate(wm.cw_sollumz_results) if item.selected and i < len(store)]
+
+
+# (key, result) of the last filter_results call; redraws repeat the same query
+_last_filter = None
+
+
+def filter_results(filter_name, invert, sort_by_name, sort_reverse, visible_flag):
+    """Return `(flags, order)` for `UIList.filter_items`, computed from the store only."""
+    global _last_filter
+    store = get_result_store()
+    key = (store.version, filter_name, invert, sort_by_name, sort_reverse)
+    if _last_filter is not None and _last_filter[0] == key:
+        return _last_filter[1]
+
+    # Like Blender's default filter: substring match unless wildcards are used
+    flags = []
+    if filter_name:
+        pattern = filter_name.lower()
+        if "*" not in pattern:
+            pattern = f"*{pattern}*"
+        flags = [visible_flag if fnmatch.fnmatchcase(k, pattern) != invert else 0 for k in store.keys]
+
+    order = []
+    if sort_by_name:
+        sorted_indices = sorted(range(len(store)), key=store.keys.__getitem__, reverse=sort_reverse)
+        order = [0] * len(store)
+        for position, index in enumerate(sorted_indices):
+            order[index] = position
+
+    _last_filter = (key, (flags, order))
+    return flags, order
+
+
+def unregister():
+    global _store, _last_filter
+    _store = None
+    _last_filter = None
@@ -0,0 +1,181 @@
+import bpy
+import collections
+import json
+
+from .client import get_client
+from .prefetch import prefetch_top_results
+from .results import append_results, clear_results, get_result_store, set_results
+from .profiling import span
+from .utils import redraw_view3d
+
+FILL_INTERVAL = 0.05
+FILL_BATCH = 200
+
+_session = None
+
+
+class SearchSession:
+    """One search query, fetched page by page and fed into the results list from a timer.
+
+    The worker thread appends results to `pending` while the response streams
+    in; `_fill_results` moves them into the result store in small
+    batches so Blender keeps redrawing. Servers that ignore `offset`/`limit`
+    are handled by keeping the surplus in `overflow` for "load more".
+    """
+
+    def __init__(self, scene_name, query, page_size):
+        self.scene_name = scene_name
+        self.query = query
+        self.page_size = page_size
+        self.offset = 0
+        self.pending = collections.deque()
+        self.overflow = collections.deque()
+        self.job = None
+        self.has_more = False
+        self.error = None
+
+    @property
+    def running(self):
+        return (self.job is not None and not self.job.done) or bool(self.pending)
+
+    def cancel(self):
+        if self.job is not None:
+            self.job.cancel()
+        self.pending.clear()
+        self.overflow.clear()
+        self.has_more = False
+
+
+def get_search_session():
+    return _session
+
+
+def _consume_page(session, job):
+    """Read one page on the worker thread, NDJSON line by line or as a JSON array."""
+    response = job.response
+    count = 0
+    with span("search page") as metrics:
+        try:
+            if "ndjson" in response.headers.get("Content-Type", ""):
+                results = (json.loads(line) for line in response.iter_lines() if line)
+            else:
+                results = response.json()
+            for result in results:
+                if job.cancelled:
+                    return
+                if count < session.page_size:
+                    session.pending.append(result)
+                else:
+                    session.overflow.append(result)
+                count += 1
+        finally:
+            response.close()
+            metrics["count"] = count
+    session.offset += min(count, session.page_size)
+    session.has_more = count >= session.page_size
+
+
+def _request_page(session, props):
+    session.job = get_client(props).submit(
+        "GET", "/search-file",
+        consume=lambda job: _consume_page(session, job),
+        params={"filename": session.query, "offset": session.offset, "limit": session.page_size},
+        stream=True,
+    )
+    if not bpy.app.timers.is_registered(_fill_results):
+        bpy.app.timers.register(_fill_results, first_interval=FILL_INTERVAL)
+
+
+def _fill_results():
+    session = _session
+    if session is None:
+        return None
+    scene = bpy.data.scenes.get(session.scene_name)
+    if scene is None:
+        session.cancel()
+        return None
+
+    props = scene.cw_sollumz_props
+    room = min(FILL_BATCH, props.search_result_limit - len(get_result_store()))
+    batch = [session.pending.popleft() for _ in range(min(room, len(session.pending)))]
+    if batch:
+        append_results(bpy.context.window_manager, batch)
+        redraw_view3d()
+
+    if len(get_result_store()) >= props.search_result_limit:
+        session.cancel()
+
+    if session.job is not None and session.job.done and not session.pending:
+        if not session.job.cancelled:
+            session.error = session.job.error_message()
+            if session.error:
+                print(f"[ERROR] Search for '{session.query}' failed: {session.error}")
+            else:
+                prefetch_top_results(scene)
+        session.has_more = session.has_more or bool(session.overflow)
+        redraw_view3d()
+        return None
+    return FILL_INTERVAL
+
+
+def start_search(scene):
+    """Cancel any running search and start a new one for the scene's query."""
+    global _session
+    props = scene.cw_sollumz_props
+    cancel_search()
+    clear_results(bpy.context.window_manager)
+    _session = SearchSession(scene.name, props.search_filename, props.search_page_size)
+    _request_page(_session, props)
+    return _session
+
+
+def run_local_search(scene, index, prefix_only=False):
+    """Fill the results list from the local index without a server round trip."""
+    global _session
+    props = scene.cw_sollumz_props
+    cancel_search()
+    with span("local index search") as metrics:
+        paths = index.search(props.search_filename, props.search_result_limit, prefix_only=prefix_only)
+        metrics["count"] = len(paths)
+    set_results(bpy.context.window_manager, paths)
+    # A finished session without a job, so the panel shows the result count
+    _session = SearchSession(scene.name, props.search_filename, props.search_page_size)
+    # As-you-type updates would start extractions for every prefix typed on the way
+    if not prefix_only:
+        prefetch_top_results(scene)
+    return len(paths)
+
+
+def load_more(scene):
+    """Fetch the next page, locally from `overflow` if the server sent everything at once."""
+    session = _session
+    if session is None or session.running or not session.has_more:
+        return False
+    props = scene.cw_sollumz_props
+    session.has_more = False
+    if session.overflow:
+        for _ in range(min(session.page_size, len(session.overflow))):
+            session.pending.append(session.overflow.popleft())
+        session.has_more = bool(session.overflow)
+        if not bpy.app.timers.is_registered(_fill_results):
+            bpy.app.timers.register(_fill_results, first_interval=FILL_INTERVAL)
+        return True
+    _request_page(session, props)
+    return True
+
+
+def cancel_search():
+    if _session is not None:
+        _session.cancel()
+
+
+def register():
+    pass
+
+
+def unregister():
+    global _session
+    cancel_search()
+    _session = None
+    if bpy.app.timers.is_registered(_fill_results):
+        bpy.app.timers.unregister(_fill_results)
@@ -0,0 +1,259 @@
+import hashlib
+import json
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+
+from .client import get_client
+
+INDEX_DIR_NAME = ".cw_index"
+INDEX_VERSION = 1
+# /search-file matches substrings, so one query per extension lists every asset
+INDEX_EXTENSIONS = (".ydr", ".yft", ".ydd", ".ytd", ".ybn", ".ytyp", ".ymap")
+FUZZY_CANDIDATE_FACTOR = 20
+
+_indexes = {}
+
+
+def compute_install_signature(gtapath):
+    """Hash of every .rpf archive (path, size, mtime) under the GTA install."""
+    entries = []
+    for root, _dirs, files in os.walk(gtapath):
+        for f in files:
+            if not f.lower().endswith(".rpf"):
+                continue
+            path = os.path.join(root, f)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((os.path.relpath(path, gtapath).lower(), stat.st_size, stat.st_mtime_ns))
+    h = hashlib.blake2b(digest_size=16)
+    for entry in sorted(entries):
+        h.update(repr(entry).encode("utf-8"))
+    return h.hexdigest()
+
+
+class LocalSearchIndex:
+    """Sorted on-disk list of RPF entry paths for one GTA install, memory-mapped for search.
+
+    The data file holds one `<lowercase basename>\\t<full path>\\n` line per
+    entry, sorted by basename; a second file stores the byte offset of every
+    line so prefix lookups can bisect without reading the whole file.
+    """
+
+    def __init__(self, directory, gtapath):
+        key = hashlib.blake2b(os.path.normcase(gtapath).encode("utf-8"), digest_size=8).hexdigest()
+        self.directory = directory
+        self.gtapath = gtapath
+        self.data_path = os.path.join(directory, f"{key}.idx")
+        self.offsets_path = os.path.join(directory, f"{key}.off")
+        self.meta_path = os.path.join(directory, f"{key}.json")
+        self.signature = None
+        self.checked = False
+        self.job = None
+        self.error = None
+        self._file = None
+        self._mm = None
+        self._offsets = array('Q')
+        self.load()
+
+    # === Loading ===
+
+    def load(self):
+        self.close()
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != INDEX_VERSION:
+                return
+            offsets = array('Q')
+            with open(self.offsets_path, "rb") as f:
+                offsets.frombytes(f.read())
+            if not offsets:
+                return
+            self._file = open(self.data_path, "rb")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._offsets = offsets
+            self.signature = meta.get("signature")
+        except (OSError, ValueError):
+            self.close()
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._offsets = array('Q')
+
+    @property
+    def loaded(self):
+        return self._mm is not None
+
+    @property
+    def building(self):
+        return self.job is not None and not self.job.done
+
+    def __len__(self):
+        return len(self._offsets)
+
+    # === Lookup ===
+
+    def _key(self, i):
+        start = self._offsets[i]
+        return self._mm[start:self._mm.find(b"\t", start)]
+
+    def _path(self, i):
+        start = self._offsets[i]
+        tab = self._mm.find(b"\t", start)
+        end = self._mm.find(b"\n", tab)
+        return self._mm[tab + 1:end].decode("utf-8")
+
+    def _line_index(self, position):
+        return bisect_right(self._offsets, position) - 1
+
+    def search(self, query, limit, prefix_only=False):
+        """Return up to `limit` paths: prefix matches, then substring, then fuzzy.
+
+        The prefix lookup is a bisect; substring and fuzzy matching scan the
+        whole file, so `prefix_only` leaves them out for as-you-type updates.
+        """
+        if not self.loaded:
+            return []
+        q = query.strip().lower().encode("utf-8")
+        if not q:
+            return []
+        found = []
+        seen = set()
+
+        def add(i):
+            if i not in seen:
+                seen.add(i)
+                found.append(i)
+
+        count = len(self._offsets)
+        i = bisect_left(range(count), q, key=self._key)
+        while i < count and len(found) < limit and self._key(i).startswith(q):
+            add(i)
+            i += 1
+
+        if prefix_only:
+            return [self._path(i) for i in found]
+        if len(found) < limit:
+            self._search_substring(q, limit, add, found)
+        if len(found) < limit and len(q) > 1:
+            self._search_fuzzy(q, limit, add, found)
+        return [self._path(i) for i in found]
+
+    def _search_substring(self, q, limit, add, found):
+        mm = self._mm
+        position = mm.find(q)
+        while position != -1 and len(found) < limit:
+            line_start = mm.rfind(b"\n", 0, position) + 1
+            if position + len(q) <= mm.find(b"\t", line_start):
+                add(self._line_index(line_start))
+            line_end = mm.find(b"\n", position)
+            if line_end == -1:
+                break
+            position = mm.find(q, line_end + 1)
+
+    def _search_fuzzy(self, q, limit, add, found):
+        # Subsequence match inside the basename column, tightest spans first
+        gap = b"[^\t\n]*?"
+        pattern = re.compile(b"^[^\t\n]*?" + gap.join(re.escape(q[i:i + 1]) for i in range(len(q))), re.MULTILINE)
+        candidates = []
+        for match in pattern.finditer(self._mm):
+            line_start = match.start()
+            span = match.end() - self._mm.find(q[:1], line_start)
+            candidates.append((span, line_start))
+            if len(candidates) >= limit * FUZZY_CANDIDATE_FACTOR:
+                break
+        for _span, line_start in sorted(candidates):
+            if len(found) >= limit:
+                break
+            add(self._line_index(line_start))
+
+    # === Building ===
+
+    def build(self, client, force=False):
+        """Fetch every entry path from the server and write new index files.
+
+        Runs on a worker thread. The new files are written next to the live
+        ones and only swapped in by `install`, because a memory-mapped file
+        can't be replaced on Windows. Returns False if the index is current.
+        """
+        signature = compute_install_signature(self.gtapath)
+        if not force and signature == self.signature:
+            return False
+
+        paths = set()
+        for extension in INDEX_EXTENSIONS:
+            response = client.request("GET", "/search-file", params={"filename": extension})
+            response.raise_for_status()
+            paths.update(response.json())
+
+        os.makedirs(self.directory, exist_ok=True)
+        lines = sorted((os.path.basename(p.replace("\\", "/")).lower(), p) for p in paths)
+        offsets = array('Q')
+        with open(self.data_path + ".tmp", "wb") as f:
+            for key, path in lines:
+                offsets.append(f.tell())
+                f.write(f"{key}\t{path}\n".encode("utf-8"))
+        with open(self.offsets_path + ".tmp", "wb") as f:
+            offsets.tofile(f)
+        with open(self.meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "signature": signature, "gtapath": self.gtapath, "count": len(lines)}, f)
+        return True
+
+    def install(self):
+        """Swap freshly built files in and remap them. Main thread only."""
+        self.close()
+        for path in (self.data_path, self.offsets_path, self.meta_path):
+            os.replace(path + ".tmp", path)
+        self.load()
+
+    def refresh(self, props, force=False):
+        """Rebuild in the background if the GTA install changed since the last build."""
+        if self.building:
+            return self.job
+        self.checked = True
+        self.error = None
+        client = get_client(props)
+        self.job = client.submit_task(lambda job: self.build(client, force), callback=self._on_built, name="search index")
+        return self.job
+
+    def _on_built(self, job):
+        if job.error is not None:
+            self.error = str(job.error)
+            print(f"[ERROR] Building search index failed: {job.error}")
+        elif job.result:
+            self.install()
+
+
+def get_local_index(props):
+    """Return the index for the configured GTA install, or None if disabled.
+
+    The first call per session checks the install signature in the background.
+    """
+    if not props.use_local_index:
+        return None
+    directory = os.path.join(props.codewalker_output_dir, INDEX_DIR_NAME)
+    key = (os.path.normcase(directory), os.path.normcase(props.gtapath))
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = LocalSearchIndex(directory, props.gtapath)
+    if not index.checked:
+        index.refresh(props)
+    return index
+
+
+def unregister():
+    for index in _indexes.values():
+        if index.job is not None:
+            index.job.cancel()
+        index.close()
+    _indexes.clear()
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+
+TEXTURE_STORE_DIR_NAME = ".cw_textures"
+PUSHED_TEXTURES_NAME = ".cw_pushed_textures.json"
+TEXTURE_EXTENSIONS = (".dds",)
+
+# (path, size, mtime_ns) -> digest, so unchanged files are hashed once per session
+_hash_memo = {}
+
+
+def is_texture(path):
+    return path.lower().endswith(TEXTURE_EXTENSIONS)
+
+
+def get_file_hash(path):
+    stat = os.stat(path)
+    key = (os.path.normcase(os.path.abspath(path)), stat.st_size, stat.st_mtime_ns)
+    digest = _hash_memo.get(key)
+    if digest is None:
+        h = hashlib.blake2b(digest_size=20)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(block)
+        digest = _hash_memo[key] = h.hexdigest()
+    return digest
+
+
+class TextureStore:
+    """Content-addressed DDS files shared by cached assets through hard links.
+
+    CodeWalker writes every texture of every downloaded asset again; after a
+    download the copies are replaced by links to one stored file per content
+    hash. Stored files no longer linked from any asset are removed by `prune`.
+    """
+
+    def __init__(self, root):
+        self.directory = os.path.join(root, TEXTURE_STORE_DIR_NAME)
+
+    def blob_path(self, digest):
+        return os.path.join(self.directory, digest[:2], digest + ".dds")
+
+    def dedupe(self, texture_dir):
+        """Link every texture in `texture_dir` to the store; returns the bytes saved."""
+        saved = 0
+        try:
+            entries = list(os.scandir(texture_dir))
+        except OSError:
+            return 0
+        for entry in entries:
+            if not entry.is_file() or not is_texture(entry.name):
+                continue
+            try:
+                stat = os.stat(entry.path)
+                if stat.st_nlink > 1:
+                    continue
+                blob = self.blob_path(get_file_hash(entry.path))
+                if os.path.isfile(blob):
+                    tmp_path = entry.path + ".tmp"
+                    os.link(blob, tmp_path)
+                    os.replace(tmp_path, entry.path)
+                    saved += stat.st_size
+                else:
+                    os.makedirs(os.path.dirname(blob), exist_ok=True)
+                    os.link(entry.path, blob)
+            except OSError:
+                # e.g. file systems without hard links; the plain copies still work
+                break
+        return saved
+
+    @staticmethod
+    def release(texture_dir):
+        """Unlink shared textures before a download overwrites them in place.
+
+        CodeWalker rewrites existing files, which would change the stored copy
+        every other asset links to.
+        """
+        try:
+            entries = list(os.scandir(texture_dir))
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                if entry.is_file() and os.stat(entry.path).st_nlink > 1:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    def prune(self):
+        """Delete stored textures that no cached asset links to any more."""
+        removed = 0
+        for root, _dirs, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if os.stat(path).st_nlink <= 1:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass
+        return removed
+
+
+class PushedTextures:
+    """Hashes of the textures each export target already received.
+
+    With the streaming transport, textures in this set are referenced by hash
+    in the /import request instead of being sent again. The set is stored
+    with the size/mtime the target archive had after the last push and is
+    dropped when the archive no longer matches (deleted, rebuilt or written
+    by something else), or when a push fails.
+    """
+
+    def __init__(self, output_dir, target, archive):
+        self.path = os.path.join(output_dir, PUSHED_TEXTURES_NAME)
+        self.target = target
+        self.archive = archive
+        self.targets = self._load()
+        entry = self.targets.get(target)
+        matches = isinstance(entry, dict) and entry.get("archive") == self._archive_signature()
+        self.hashes = set(entry["hashes"]) if matches else set()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _archive_signature(self):
+        try:
+            stat = os.stat(self.archive)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def split(self, files):
+        """Return `(files to send, {name: hash} for every texture, {name: hash} to reference)`."""
+        send = []
+        hashes = {}
+        references = {}
+        for upload_name, path in files:
+            if is_texture(upload_name):
+                digest = hashes[upload_name] = get_file_hash(path)
+                if digest in self.hashes:
+                    references[upload_name] = digest
+                    continue
+            send.append((upload_name, path))
+        return send, hashes, references
+
+    def update(self, hashes):
+        self.hashes.update(hashes)
+
+    def clear(self):
+        # A failed push may have left the target without textures it was sent before
+        self.hashes.clear()
+
+    def save(self):
+        # Stamped after the push, which itself rewrote the archive
+        self.targets[self.target] = {"archive": self._archive_signature(), "hashes": sorted(self.hashes)}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.targets, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,147 @@
+import os
+import tempfile
+import uuid
+import zipfile
+import zlib
+
+from .cache import get_texture_dir_name, get_xml_name
+from .profiling import span
+
+CHUNK_SIZE = 1024 * 1024
+# Streamed archives smaller than this never touch the disk before extraction
+SPOOL_LIMIT = 64 * 1024 * 1024
+
+
+def submit_download(client, transport, paths, directory, callback=None):
+    """Queue a download of `paths` into the local `directory` with the chosen transport.
+
+    SHARED_FOLDER lets CodeWalker write straight into `directory`, which only
+    works when both sides see the same path. STREAM receives the files in the
+    response body instead.
+    """
+    if transport == 'STREAM':
+        return client.submit_task(
+            lambda job: download_stream(client, paths, directory, job),
+            callback=callback,
+            name="/download-files (stream)",
+        )
+    return client.submit("GET", "/download-files", callback=callback, params={
+        "fullPaths": paths,
+        "xml": "true",
+        "outputFolderPath": directory
+    })
+
+
+def _safe_target(directory, name):
+    target = os.path.normpath(os.path.join(directory, name))
+    if os.path.commonpath([os.path.abspath(target), os.path.abspath(directory)]) != os.path.abspath(directory):
+        raise ValueError(f"Refusing to write outside the output directory: {name}")
+    return target
+
+
+def download_stream(client, paths, directory, job=None):
+    """Fetch `paths` as a streamed response body and unpack them into `directory`.
+
+    A single asset arrives as plain XML and is written once to its final
+    location. Several assets (or an asset with textures) arrive as a zip
+    archive that is spooled in memory and extracted. gzip Content-Encoding is
+    decoded transparently by requests.
+    """
+    os.makedirs(directory, exist_ok=True)
+    response = client.request("GET", "/download-files", params={
+        "fullPaths": paths,
+        "xml": "true",
+        "stream": "true"
+    }, stream=True)
+    with span("stream download", count=len(paths)) as metrics, response:
+        response.raise_for_status()
+        received = 0
+        if "zip" in response.headers.get("Content-Type", ""):
+            with tempfile.SpooledTemporaryFile(max_size=SPOOL_LIMIT) as spool:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    if job is not None and job.cancelled:
+                        return
+                    spool.write(chunk)
+                    received += len(chunk)
+                spool.seek(0)
+                with zipfile.ZipFile(spool) as archive:
+                    for member in archive.infolist():
+                        if member.is_dir():
+                            continue
+                        target = _safe_target(directory, member.filename)
+                        os.makedirs(os.path.dirname(target), exist_ok=True)
+                        with archive.open(member) as source, open(target, "wb") as f:
+                            while True:
+                                block = source.read(CHUNK_SIZE)
+                                if not block:
+                                    break
+                                f.write(block)
+        else:
+            target = _safe_target(directory, get_xml_name(paths[0]))
+            with open(target, "wb") as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    if job is not None and job.cancelled:
+                        return
+                    f.write(chunk)
+                    received += len(chunk)
+        metrics["bytes"] = received
+
+
+def collect_upload_files(xml_paths):
+    """Return `(upload name, local path)` for each XML and the files of its texture folder."""
+    files = []
+    for xml_path in xml_paths:
+        directory, xml_name = os.path.split(xml_path)
+        files.append((xml_name, xml_path))
+        texture_dir = os.path.join(directory, get_texture_dir_name(xml_name))
+        if os.path.isdir(texture_dir):
+            for root, _dirs, names in os.walk(texture_dir):
+                for name in names:
+                    path = os.path.join(root, name)
+                    files.append((os.path.relpath(path, directory).replace("\\", "/"), path))
+    return files
+
+
+def _iter_gzip(path):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip container
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(CHUNK_SIZE)
+            if not block:
+                break
+            compressed = compressor.compress(block)
+            if compressed:
+                yield compressed
+    yield compressor.flush()
+
+
+def iter_multipart(fields, files, boundary):
+    """Yield a multipart/form-data body; every file part is gzip-compressed on the fly."""
+    delimiter = f"--{boundary}\r\n".encode("ascii")
+    for name, value in fields.items():
+        yield delimiter
+        yield f'Content-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode("utf-8")
+    for upload_name, path in files:
+        yield delimiter
+        yield (
+            f'Content-Disposition: form-data; name="files"; filename="{upload_name}"\r\n'
+            f"Content-Type: application/gzip\r\n\r\n"
+        ).encode("utf-8")
+        yield from _iter_gzip(path)
+        yield b"\r\n"
+    yield f"--{boundary}--\r\n".encode("ascii")
+
+
+def upload_stream(client, fields, files):
+    """POST `files` to /import as a chunked, gzip-compressed multipart body.
+
+    Generator bodies make requests use chunked transfer encoding, so nothing
+    is buffered beyond one compressed block.
+    """
+    boundary = f"cwsollumz{uuid.uuid4().hex}"
+    with span("stream upload", count=len(files)):
+        return client.request(
+            "POST", "/import",
+            data=iter_multipart(fields, files, boundary),
+            headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+        )
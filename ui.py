@@ -1,19 +1,47 @@
 import bpy
 from bpy.types import Panel, UIList
-import os
 from .ops import SyncBackendConfigOperator  # ✅ Move Operator to ops
+from .config_sync import get_synced_config
+from .journal import peek_unfinished
+from .health import get_deferred_operations, get_health_monitor
+from .search import get_search_session
+from .search_index import get_local_index
+from .previews import get_preview_icon
+from .profiling import profiler
+from .results import filter_results, get_result_store
+
+PERFORMANCE_ROWS = 12
 
 class CW_Sollumz_UIList(UIList):
     bl_idname = "CW_SOL_UL_SEARCH_LIST"
 
     def draw_item(self, context, layout, data, item, icon, active_data, active_property, index):
+        store = get_result_store()
+        if index >= len(store):
+            return
         row = layout.row(align=True)
-        filename = os.path.basename(item.name)
-        folder = os.path.dirname(item.name)
-        row.label(text=filename, icon="FILE")
+        row.prop(item, "selected", text="")
+        # Only rows that are drawn ask for a thumbnail
+        icon_value = get_preview_icon(context.scene, store.paths[index])
+        if icon_value:
+            row.label(text=store.names[index], icon_value=icon_value)
+        else:
+            row.label(text=store.names[index], icon="FILE")
         op = row.operator("cw_sollumz.import_file", text="Import")
         op.index = index
 
+    def filter_items(self, context, data, propname):
+        # Rows have no name in RNA; filter and sort on the store's precomputed keys
+        if len(getattr(data, propname)) != len(get_result_store()):
+            return [], []
+        return filter_results(
+            self.filter_name,
+            self.use_filter_invert,
+            self.use_filter_sort_alpha,
+            self.use_filter_sort_reverse,
+            self.bitflag_filter_item,
+        )
+
 class CodeWalkerSollumzPanel(Panel):
     bl_label = "CodeWalker-Sollumz API Panel"
     bl_idname = "CW_SOL_PANEL_PT_main"
@@ -35,8 +63,31 @@ class CodeWalkerSollumzPanel(Panel):
         row = box.row()
         row.prop(props, "show_api_section", text="", icon="TRIA_DOWN" if props.show_api_section else "TRIA_RIGHT", emboss=False)
         row.label(text="API Configuration")
+        monitor = get_health_monitor(props)
+        latency_ms = monitor.latency_ms
+        if monitor.state == 'ONLINE' and latency_ms is not None:
+            version = f", {monitor.version}" if monitor.version else ""
+            row.label(text=f"{latency_ms:.0f} ms{version}", icon="CHECKMARK")
+        elif monitor.state == 'OFFLINE':
+            row.label(text="Unreachable", icon="ERROR")
+        else:
+            row.label(text="Checking...", icon="SORTTIME")
+        queued = len(get_deferred_operations())
+        if queued:
+            row = box.row(align=True)
+            row.label(text=f"{queued} operation(s) queued until the backend is back", icon="TIME")
+            row.operator("cw_sollumz.clear_queued_operations", text="", icon="X")
+        if props.transport_mode == 'STREAM' and monitor.capabilities.get("stream") is False:
+            box.label(text="Backend does not support the Stream transport", icon="ERROR")
         if props.show_api_section:
-            box.prop(props, "api_port")
+            row = box.row(align=True)
+            row.prop(props, "api_port")
+            row.prop(props, "health_check_interval", text="Check (s)")
+            row = box.row(align=True)
+            row.prop(props, "request_timeout", text="Timeout")
+            row.prop(props, "request_retries")
+            row.prop(props, "connection_pool_size")
+            box.prop(props, "transport_mode")
             row = box.row()
             row.prop(props, "gtapath")
             op = row.operator("cw_sollumz.pick_folder", text="", icon="FILE_FOLDER")
@@ -62,8 +113,24 @@ class CodeWalkerSollumzPanel(Panel):
             op = row.operator("cw_sollumz.pick_folder", text="", icon="FILE_FOLDER")
             op.folder_prop = "rpf_path"
 
+            row = box.row(align=True)
+            row.prop(props, "use_asset_cache")
+            row.prop(props, "cache_size_mb", text="Max MB")
+            row.operator("cw_sollumz.clear_cache", text="", icon="TRASH")
+            box.prop(props, "dedupe_textures")
+            box.prop(props, "instance_imports")
+            row = box.row(align=True)
+            row.active = props.use_asset_cache
+            row.prop(props, "use_library_cache")
+            sub = row.row(align=True)
+            sub.active = props.use_asset_cache and props.use_library_cache
+            sub.prop(props, "library_link", text="Link")
+
             box.operator("cw_sollumz.sync_config")
             box.operator("cw_sollumz.pull_config", text="Pull Config")
+            sync_error = get_synced_config(props).error
+            if sync_error:
+                box.label(text=f"Last sync failed: {sync_error}", icon="ERROR")
 
         box = layout.box()
         row = box.row()
@@ -71,7 +138,19 @@ class CodeWalkerSollumzPanel(Panel):
         row.label(text="Export")
         if props.show_export_section:
             box.prop(props, "export_with_ytyp")
+            row = box.row(align=True)
+            row.prop(props, "ytyp_mode", text="")
+            if props.ytyp_mode == 'SINGLE':
+                row.prop(props, "ytyp_name", text="")
+            box.prop(props, "incremental_export")
+            row = box.row(align=True)
+            row.prop(props, "upload_batch_size")
+            row.prop(props, "upload_retries", text="Retries")
             box.operator("cw_sollumz.export_to_rpf")
+            unfinished = peek_unfinished(props.blender_output_dir)
+            if unfinished is not None:
+                remaining, unpushed = unfinished
+                box.operator("cw_sollumz.resume_export", text=f"Resume Interrupted Export ({remaining} left, {unpushed} to push)", icon="RECOVER_LAST")
             box.operator("cw_sollumz.export_ytyp")
 
         box = layout.box()
@@ -80,10 +159,82 @@ class CodeWalkerSollumzPanel(Panel):
         row.label(text="Search Files")
         if props.show_search_section:
             box.prop(props, "search_filename")
+            row = box.row(align=True)
+            row.prop(props, "use_local_index")
+            index = get_local_index(props)
+            if index is not None:
+                if index.building:
+                    row.label(text="Building...", icon="SORTTIME")
+                elif index.error:
+                    row.label(text="Index failed", icon="ERROR")
+                else:
+                    row.label(text=f"{len(index)} entries")
+                row.operator("cw_sollumz.refresh_search_index", text="", icon="FILE_REFRESH")
+            row = box.row(align=True)
+            row.prop(props, "search_page_size", text="Page")
+            row.prop(props, "search_result_limit", text="Limit")
+            row = box.row(align=True)
+            row.prop(props, "use_prefetch")
+            sub = row.row(align=True)
+            sub.active = props.use_prefetch and props.use_asset_cache
+            sub.prop(props, "prefetch_count")
+            sub.prop(props, "prefetch_concurrency")
+            sub.prop(props, "prefetch_budget_mb", text="MB")
+            row = box.row(align=True)
+            row.prop(props, "use_previews")
+            sub = row.row(align=True)
+            sub.active = props.use_previews and props.use_asset_cache
+            sub.prop(props, "preview_cache_size", text="Keep")
             box.operator("cw_sollumz.search_file")
 
         layout.label(text="Results:", icon="PREVIEW_RANGE")
-        layout.template_list("CW_SOL_UL_SEARCH_LIST", "", props, "search_results", scene, "cw_sollumz_active_index")
+        wm = context.window_manager
+        result_count = len(get_result_store())
+        layout.template_list("CW_SOL_UL_SEARCH_LIST", "", wm, "cw_sollumz_results", wm, "cw_sollumz_active_index")
+        if props.use_previews and 0 <= wm.cw_sollumz_active_index < result_count:
+            icon_value = get_preview_icon(scene, get_result_store()[wm.cw_sollumz_active_index])
+            if icon_value:
+                layout.template_icon(icon_value=icon_value, scale=6.0)
+
+        session = get_search_session()
+        if session is not None and session.scene_name == scene.name:
+            row = layout.row(align=True)
+            if session.running:
+                row.label(text=f"Searching... {result_count} loaded", icon="SORTTIME")
+                row.operator("cw_sollumz.cancel_search", text="", icon="CANCEL")
+            elif session.error:
+                row.label(text=f"Search failed: {session.error}", icon="ERROR")
+            elif session.has_more:
+                row.label(text=f"{result_count} loaded")
+                row.operator("cw_sollumz.load_more_results", icon="ADD")
+            else:
+                row.label(text=f"Found {result_count} files.")
+
+        row = layout.row(align=True)
+        row.operator("cw_sollumz.select_results", text="All").action = 'SELECT'
+        row.operator("cw_sollumz.select_results", text="None").action = 'DESELECT'
+        row.operator("cw_sollumz.select_results", text="Invert").action = 'INVERT'
+        row = layout.row(align=True)
+        row.operator("cw_sollumz.import_selected", icon="IMPORT")
+        row.prop(props, "batch_chunk_size", text="Chunk")
+
+        box = layout.box()
+        row = box.row()
+        row.prop(props, "show_performance_section", text="", icon="TRIA_DOWN" if props.show_performance_section else "TRIA_RIGHT", emboss=False)
+        row.label(text="Performance")
+        if props.show_performance_section:
+            summary = profiler.summary()
+            if not summary:
+                box.label(text="No timings recorded yet.")
+            for entry in summary[:PERFORMANCE_ROWS]:
+                row = box.row()
+                row.label(text=entry["name"])
+                row.label(text=f"{entry['count']}x  {entry['total_ms'] / entry['count']:.1f} ms avg  {entry['total_ms'] / 1000:.2f} s")
+                if entry["bytes"]:
+                    row.label(text=f"{entry['bytes'] / 1048576:.1f} MB")
+            row = box.row(align=True)
+            row.operator("cw_sollumz.export_profile", icon="EXPORT")
+            row.operator("cw_sollumz.clear_profile", text="", icon="TRASH")
 
         layout.separator()
 
@@ -1,4 +1,8 @@
 import bpy
+import os
+import re
+from .hierarchy import get_hierarchy_index
+from .profiling import span
 
 
 
@@ -6,17 +10,79 @@ import bpy
 def get_api_base_url(port):
     return f"http://localhost:{port}/api"
 
+def redraw_view3d():
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
 def import_file(directory, file_name):
     try:
-        result = bpy.ops.sollumz.import_assets(
-            directory=directory,
-            files=[{"name": file_name}],
-        )
+        with span("sollumz.import_assets", count=1):
+            result = bpy.ops.sollumz.import_assets(
+                directory=directory,
+                files=[{"name": file_name}],
+            )
         return result == {'FINISHED'}
     except Exception as e:
         print(f"[ERROR] Failed to import file '{file_name}': {e}")
         return False
+
+def import_files(directory, file_names):
+    try:
+        with span("sollumz.import_assets", count=len(file_names)):
+            result = bpy.ops.sollumz.import_assets(
+                directory=directory,
+                files=[{"name": file_name} for file_name in file_names],
+            )
+        return result == {'FINISHED'}
+    except Exception as e:
+        print(f"[ERROR] Failed to import {len(file_names)} file(s) from '{directory}': {e}")
+        return False
     
+def get_export_stem(file_name):
+    """`Prop_A.ydr.xml` -> `prop_a`, or None for anything that isn't an exported XML."""
+    if not file_name.lower().endswith(".xml"):
+        return None
+    stem, dot, _ext = file_name[:-4].rpartition(".")
+    return stem.lower() if dot else None
+
+# Resource types Sollumz writes as `<name>.<type>.xml`
+EXPORT_EXTENSIONS = ("ydr", "yft", "ybn", "ydd", "ycd", "ytd", "ymap", "ytyp")
+
+def find_exported_files(directory, stem, since=None):
+    """XML paths for `stem` found by name, without listing `directory`."""
+    paths = []
+    for extension in EXPORT_EXTENSIONS:
+        path = os.path.join(directory, f"{stem}.{extension}.xml")
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            continue
+        if since is None or mtime >= since:
+            paths.append(path)
+    return paths
+
+def index_exported_files(directory, since=None):
+    """Map lowercase export stem -> XML paths in `directory` with a single scandir pass.
+
+    Files last modified before `since` (a time.time() value) are left out, so
+    leftovers from earlier runs are not picked up again.
+    """
+    index = {}
+    with span("scan output directory") as metrics, os.scandir(directory) as entries:
+        scanned = 0
+        for entry in entries:
+            scanned += 1
+            stem = get_export_stem(entry.name)
+            if stem is None or not entry.is_file():
+                continue
+            if since is not None and entry.stat().st_mtime < since:
+                continue
+            index.setdefault(stem, []).append(entry.path)
+        metrics["count"] = scanned
+    return index
+
 def filter_only_top_level_objects(objects):
     local_set = set(objects)
     return [obj for obj in objects if obj.parent not in local_set]
@@ -31,6 +97,68 @@ def promote_to_root_objects(objects):
         result.add(top)
     return list(result)
 
+def get_descendants(root):
+    """Everything parented below `root`, like `root.children_recursive` without scanning all objects."""
+    return get_hierarchy_index().descendants_of(root)
+
+def select_only(context, objects):
+    """Make `objects` the selection, with the first one active."""
+    for obj in context.selected_objects:
+        obj.select_set(False)
+    for obj in objects:
+        obj.select_set(True)
+    if objects:
+        context.view_layer.objects.active = objects[0]
+
+def get_ytyp_groups(objects, mode, single_name=""):
+    """Group root objects into `[(ytyp name, [objects])]` for the given YTYP mode.
+
+    PER_OBJECT gives every object its own YTYP, SINGLE puts all of them in one
+    YTYP and PER_COLLECTION uses one YTYP per (first) owning collection.
+    """
+    if mode == 'SINGLE':
+        name = single_name or bpy.path.display_name_from_filepath(bpy.data.filepath) or objects[0].name
+        return [(name.lower(), list(objects))]
+
+    groups = {}
+    for obj in objects:
+        if mode == 'PER_COLLECTION':
+            name = obj.users_collection[0].name if obj.users_collection else "scene"
+        else:
+            name = obj.name
+        groups.setdefault(name.lower(), []).append(obj)
+    return list(groups.items())
+
+def build_ytyp_index(scene):
+    return {ytyp.name.lower(): i for i, ytyp in enumerate(scene.ytyps)}
+
+def export_ytyp_group(context, name, objects, directory, ytyp_index):
+    """Create or reuse the YTYP `name`, add archetypes for `objects` and export it once.
+
+    `ytyp_index` maps lowercase YTYP names to their index in `scene.ytyps`
+    and is updated when a YTYP has to be created.
+    """
+    scene = context.scene
+    index = ytyp_index.get(name)
+    if index is None:
+        bpy.ops.sollumz.createytyp()
+        index = len(scene.ytyps) - 1
+        scene.ytyps[index].name = name
+        ytyp_index[name] = index
+    scene.ytyp_index = index
+
+    # Only add archetypes the YTYP doesn't have yet, so re-exports don't duplicate them
+    existing = {archetype.name.lower() for archetype in scene.ytyps[index].archetypes}
+    missing = [obj for obj in objects if obj.name.lower() not in existing]
+    if missing:
+        bpy.ops.object.select_all(action='DESELECT')
+        for obj in missing:
+            obj.select_set(True)
+        context.view_layer.objects.active = missing[0]
+        bpy.ops.sollumz.createarchetypefromselected()
+
+    bpy.ops.sollumz.exportytyp(directory=directory)
+
 # This is a default equivalence profile for comparing objects, prepared for additional requirements
 # in the future. It can be modified to include or exclude specific properties.
 DEFAULT_EQUIVALENCE_PROFILE = {
@@ -91,10 +219,88 @@ def are_objects_equivalent(obj1, obj2, profile=None):
     return True
 
 
-def get_canonical_object_name(obj, scene_objects, profile=None):
-    import re
+_DUPLICATE_NAME_RE = re.compile(r"^(.*)\.(\d{3})$")
+
+def _pointer(id_data):
+    return id_data.as_pointer() if id_data is not None else None
+
+def to_plain_value(value):
+    """Plain Python dict/list for an ID property group or array, other values unchanged."""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if hasattr(value, "to_list"):
+        return value.to_list()
+    return value
+
+def _hashable_value(value):
+    # Hashable but still compared with ==, so 1 and 1.0 stay equal like in are_objects_equivalent
+    value = to_plain_value(value)
+    if isinstance(value, dict):
+        return (dict, tuple(sorted((k, _hashable_value(v)) for k, v in value.items())))
+    if isinstance(value, (list, tuple)):
+        return (list, tuple(_hashable_value(v) for v in value))
+    return value
+
+def get_equivalence_signature(obj, profile=None):
+    """Hashable summary of the attributes `profile` compares.
+
+    Two objects have equal signatures exactly when `are_objects_equivalent`
+    considers them equivalent, so duplicates can be grouped by dict lookup.
+    """
+    if profile is None:
+        profile = DEFAULT_EQUIVALENCE_PROFILE
+
+    signature = [obj.type]
+    if profile.get("mesh", False):
+        signature.append(_pointer(obj.data))
+    if profile.get("transform", False):
+        signature.append((tuple(obj.location), tuple(obj.rotation_euler), tuple(obj.scale)))
+    if profile.get("modifiers", False):
+        signature.append(tuple(m.type for m in obj.modifiers))
+    if profile.get("materials", False):
+        signature.append(tuple(_pointer(slot.material) for slot in obj.material_slots))
+    if profile.get("custom_properties", False):
+        signature.append(tuple(sorted(
+            (k, _hashable_value(obj[k])) for k in obj.keys() if not k.startswith("_")
+        )))
+    if profile.get("flags", False):
+        signature.append(repr(getattr(obj, "flags", None)))
+    return tuple(signature)
+
+class EquivalenceIndex:
+    """Canonical export names for a set of objects, built once per export.
+
+    Equivalent `name.001`-style duplicates resolve to their base object's name
+    with a dict lookup instead of a per-call regex and pairwise comparison.
+    """
+
+    def __init__(self, scene_objects, profile=None):
+        self.profile = profile if profile is not None else DEFAULT_EQUIVALENCE_PROFILE
+        self._canonical = {}
+        signatures = {}
+        by_name = {obj.name: obj for obj in scene_objects}
 
-    match = re.match(r"^(.*)\.(\d{3})$", obj.name)
+        def signature_of(obj):
+            signature = signatures.get(obj.name)
+            if signature is None:
+                signature = signatures[obj.name] = get_equivalence_signature(obj, self.profile)
+            return signature
+
+        for obj in by_name.values():
+            canonical = obj.name
+            match = _DUPLICATE_NAME_RE.match(obj.name)
+            if match:
+                base_obj = by_name.get(match.group(1))
+                if base_obj is not None and signature_of(obj) == signature_of(base_obj):
+                    canonical = base_obj.name
+            self._canonical[obj.name] = canonical
+
+    def canonical_name(self, obj):
+        return self._canonical.get(obj.name, obj.name)
+
+
+def get_canonical_object_name(obj, scene_objects, profile=None):
+    match = _DUPLICATE_NAME_RE.match(obj.name)
     if not match:
         return obj.name  # not a duplicate
 
@@ -106,4 +312,4 @@ def get_canonical_object_name(obj, scene_objects, profile=None):
     if are_objects_equivalent(obj, base_obj, profile=profile):
         return base_name
 
-    return obj.name
\ No newline at end of file
+    return obj.name